@@ -0,0 +1,56 @@
+from tetris_game.board import Board
+
+ROWS = 21
+COLS = 10
+SEED = 2024  # Piece queue seed of every benchmark game
+
+# Boards are written top to bottom, one string per row ('.' for empty), and padded with empty rows on top.
+BOARDS = {
+    'empty': [],
+    # The mid-game board in example_board.png: hold S, preview J T O L I
+    'example': [
+        '..T.......',
+        '.TTJJJ....',
+        'L.TZZJS...',
+        'L...ZZSSOO',
+        'LL.IIIISOO',
+    ],
+    # Messier stack with holes and overhangs, from 13 random placements of seed 16
+    'messy': [
+        'OO..SSZZ..',
+        'OO.SSZZZZ.',
+        'JJ....ZZ..',
+        'J.....OOT.',
+        'J.....OOTT',
+        'IIIII..ST.',
+        'I.J...TSS.',
+        'I.J..TT.SL',
+        'IJJ...TLLL',
+    ],
+    # Four complete rows under some garbage, for line clears
+    'quad': [
+        '....T.....',
+        '...TTT..J.',
+        'LLLSSOOJJJ',
+        'ZZLSSOOIII',
+        'IZZLOOJTTT',
+        'SSLLOOJJTZ',
+    ],
+}
+
+EXAMPLE_HOLD = 'S'
+EXAMPLE_QUEUE = ('J', 'T', 'O', 'L', 'I')
+
+
+def board_grid(name):
+    """The fixture as a list-of-lists grid of piece letters (0 for empty)."""
+    rows = BOARDS[name]
+    grid = [[0] * COLS for _ in range(ROWS - len(rows))]
+    for row in rows:
+        grid.append([0 if cell == '.' else cell for cell in row])
+    return grid
+
+
+def make_board(name):
+    """Build a fresh Board for a fixture."""
+    return Board.from_grid(board_grid(name))
@@ -0,0 +1,225 @@
+import argparse
+import json
+import math
+import platform
+import statistics
+import sys
+import time
+from benchmarks.fixtures import SEED, EXAMPLE_HOLD, EXAMPLE_QUEUE, make_board
+from bot.find_best_move import find_best_move, evaluate_boards
+from bot.get_valid_moves import get_possible_moves_simulate, generate_placements
+from tetris_game.engine import TetrisEngine
+from tetris_game.gravity import Gravity
+from tetris_game.piece_masks import get_piece_masks
+from tetris_game.tetromino import Tetromino
+
+DEFAULT_ROUNDS = 7
+DEFAULT_MIN_TIME = 0.05  # Seconds per timed round; the loop count is raised until a round takes this long
+DEFAULT_THRESHOLD = 0.10  # Relative slowdown that counts as a regression
+
+
+def bench_check_collision(board_name):
+    board = make_board(board_name)
+    piece = Tetromino('T')
+    piece.x = 3
+    piece.y = 14
+    return lambda: piece.check_collision(board, 0, 1)
+
+
+def bench_rotate(board_name):
+    # A T in the example stack that only turns clockwise after trying two kicks
+    board = make_board(board_name)
+    piece = Tetromino('T')
+
+    def op():
+        piece.x = 3
+        piece.y = 15
+        piece.rotation = 0
+        piece.shape = piece.shape_data[0]
+        piece.rotate(board)
+    return op
+
+
+def bench_hard_drop(board_name):
+    # Each drop restores the fixture first, so the time includes one colored board copy
+    base = make_board(board_name)
+    game = TetrisEngine(seed=SEED)
+
+    def op():
+        game.board = base.copy(colors=True)
+        game.hard_drop()
+    return op
+
+
+def bench_drop_distance(board_name):
+    # A T above the stack, where the distance comes from the column heights
+    board = make_board(board_name)
+    entry = get_piece_masks(board.cols)['T'][0][3]
+    return lambda: board.drop_distance(entry, 0)
+
+
+def bench_gravity_frame(board_name):
+    # One level 1 frame: mostly falling, with a lock about every 20 seconds of game time
+    game = TetrisEngine(seed=SEED)
+    game.board = make_board(board_name).copy(colors=True)
+    gravity = Gravity(game, level=1)
+
+    def op():
+        if game.game_over:
+            game.reset_board_and_bag(SEED)
+        gravity.advance(1)
+    return op
+
+
+def bench_board_copy(board_name):
+    board = make_board(board_name)
+    return lambda: board.copy()
+
+
+def bench_clear_lines(board_name):
+    # Clearing changes the board, so each op clears a fresh copy; compare with board.copy
+    board = make_board(board_name)
+    return lambda: board.copy().clear_lines()
+
+
+def bench_possible_moves(board_name):
+    board = make_board(board_name)
+    piece = Tetromino('T')
+    return lambda: get_possible_moves_simulate(piece, board)
+
+
+def bench_evaluate_boards(board_name):
+    # One root's children as the search scores them: every placement of the T and of the held piece
+    board = make_board(board_name)
+    masks = get_piece_masks(board.cols)
+    child_rows = []
+    lines_cleared = []
+    for piece_type in ('T', EXAMPLE_HOLD):
+        for x, y, rotation, _ in generate_placements(board, piece_type):
+            lines, record = board.place(masks[piece_type][rotation][x].rows, y)
+            child_rows.append(board.bits[:])
+            lines_cleared.append(lines)
+            board.undo(record)
+    return lambda: evaluate_boards(child_rows, lines_cleared, cols=board.cols)
+
+
+def bench_find_best_move(board_name):
+    board = make_board(board_name)
+    piece = Tetromino('T')
+    hold = Tetromino(EXAMPLE_HOLD)
+    return lambda: find_best_move(piece, board, EXAMPLE_QUEUE, hold, depth=3)
+
+
+# (name, setup, fixture); setup builds the state and returns the operation to time
+BENCHMARKS = [
+    ('check_collision', bench_check_collision, 'example'),
+    ('rotate', bench_rotate, 'example'),
+    ('hard_drop', bench_hard_drop, 'example'),
+    ('drop_distance', bench_drop_distance, 'empty'),
+    ('drop_distance', bench_drop_distance, 'example'),
+    ('gravity_frame', bench_gravity_frame, 'example'),
+    ('board_copy', bench_board_copy, 'quad'),
+    ('clear_lines', bench_clear_lines, 'quad'),
+    ('possible_moves', bench_possible_moves, 'empty'),
+    ('possible_moves', bench_possible_moves, 'example'),
+    ('possible_moves', bench_possible_moves, 'messy'),
+    ('evaluate_boards', bench_evaluate_boards, 'example'),
+    ('evaluate_boards', bench_evaluate_boards, 'messy'),
+    ('find_best_move', bench_find_best_move, 'example'),
+]
+
+
+def time_loops(op, loops):
+    start = time.perf_counter()
+    for _ in range(loops):
+        op()
+    return time.perf_counter() - start
+
+
+def measure(op, rounds=DEFAULT_ROUNDS, min_time=DEFAULT_MIN_TIME):
+    """Time `op` over several rounds and return ops/sec statistics."""
+    loops = 1
+    while time_loops(op, loops) < min_time:
+        loops *= 2
+    samples = [loops / time_loops(op, loops) for _ in range(rounds)]
+    return {
+        'mean': statistics.mean(samples),
+        'stdev': statistics.stdev(samples) if rounds > 1 else 0.0,
+        'min': min(samples),
+        'max': max(samples),
+        'rounds': rounds,
+        'loops': loops,
+    }
+
+
+def run(name_filter=None, rounds=DEFAULT_ROUNDS, min_time=DEFAULT_MIN_TIME):
+    """Run every benchmark whose name contains `name_filter` and return {name: ops/sec statistics}."""
+    results = {}
+    for name, setup, board_name in BENCHMARKS:
+        full_name = f"{name}[{board_name}]"
+        if name_filter and name_filter not in full_name:
+            continue
+        results[full_name] = measure(setup(board_name), rounds, min_time)
+        print(f"{full_name:32} {results[full_name]['mean']:12.1f} ops/sec", file=sys.stderr)
+    return results
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Compare results with a baseline run. A benchmark regressed when it is more than `threshold` slower
+    and the drop is larger than twice the combined standard deviation of the two runs.
+    Returns {name: comparison} for the benchmarks present in both.
+    """
+    comparison = {}
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        change = result['mean'] / base['mean'] - 1
+        noise = 2 * math.hypot(result['stdev'], base['stdev'])
+        comparison[name] = {
+            'baseline': base['mean'],
+            'change': change,
+            'regression': change < -threshold and base['mean'] - result['mean'] > noise,
+        }
+    return comparison
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the engine and bot hot paths.")
+    parser.add_argument('--filter', default=None, help="only run benchmarks whose name contains this")
+    parser.add_argument('--rounds', type=int, default=DEFAULT_ROUNDS)
+    parser.add_argument('--min-time', type=float, default=DEFAULT_MIN_TIME)
+    parser.add_argument('--output', default=None, help="write the JSON report here instead of stdout")
+    parser.add_argument('--compare', default=None, help="JSON report of an earlier run to check for regressions")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    report = {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'seed': SEED,
+        'benchmarks': run(args.filter, args.rounds, args.min_time),
+    }
+    regressions = []
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['benchmarks']
+        report['comparison'] = compare(report['benchmarks'], baseline, args.threshold)
+        for name, result in report['comparison'].items():
+            flag = "REGRESSION" if result['regression'] else ""
+            print(f"{name:32} {result['change']:+8.1%} {flag}", file=sys.stderr)
+            if result['regression']:
+                regressions.append(name)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
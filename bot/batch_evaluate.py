@@ -0,0 +1,94 @@
+import numpy as np
+
+# Feature weights for the score vector. The defaults reproduce evaluate_board (lines and tallest column);
+# the other features are computed in the same pass and can be weighted in for tuning.
+DEFAULT_WEIGHTS = {
+    'lines_cleared': 100,
+    'max_height': -2,
+    'aggregate_height': 0,
+    'holes': 0,
+    'bumpiness': 0,
+    'row_transitions': 0,
+    'column_transitions': 0,
+    'wells': 0,
+}
+
+
+def boards_to_cells(boards, cols=None):
+    """
+    Unpack Board objects, or sequences of row bitmasks for a board `cols` wide,
+    into an (N, rows, cols) boolean array.
+    """
+    first = boards[0]
+    if hasattr(first, 'bits'):
+        cols = first.cols
+        bits = np.array([board.bits for board in boards], dtype=np.int64)
+    else:
+        bits = np.array(boards, dtype=np.int64)
+    return (bits[:, :, None] >> np.arange(cols, dtype=np.int64) & 1).astype(bool)
+
+
+def board_features(cells, lines_cleared=None):
+    """
+    Compute every evaluation feature for a stack of boards in one vectorized pass.
+    `cells` is an (N, rows, cols) boolean array with row 0 at the top; `lines_cleared` optionally credits
+    lines already removed before these boards. Returns a dict of arrays: per-column heights (N, cols) and
+    per-board holes, bumpiness, row/column transitions, wells and lines cleared (N,).
+    """
+    count, rows, cols = cells.shape
+    filled_columns = cells.any(axis=1)
+    heights = np.where(filled_columns, rows - cells.argmax(axis=1), 0)
+
+    # Everything at or below the first filled cell of a column counts as covered
+    covered = np.logical_or.accumulate(cells, axis=1)
+    holes = np.count_nonzero(covered, axis=(1, 2)) - np.count_nonzero(cells, axis=(1, 2))
+
+    bumpiness = np.abs(np.diff(heights, axis=1)).sum(axis=1)
+
+    # Walls count as filled for row transitions, the floor for column transitions
+    open_cells = ~cells
+    row_transitions = (np.count_nonzero(cells[:, :, 1:] != cells[:, :, :-1], axis=(1, 2))
+                       + np.count_nonzero(open_cells[:, :, 0], axis=1) + np.count_nonzero(open_cells[:, :, -1], axis=1))
+    column_transitions = (np.count_nonzero(cells[:, 1:, :] != cells[:, :-1, :], axis=(1, 2))
+                          + np.count_nonzero(open_cells[:, -1, :], axis=1))
+
+    # Well cells are uncovered cells with both neighbours filled (or a wall)
+    walled_left = np.ones_like(cells)
+    walled_left[:, :, 1:] = cells[:, :, :-1]
+    walled_right = np.ones_like(cells)
+    walled_right[:, :, :-1] = cells[:, :, 1:]
+    wells = np.count_nonzero(~covered & walled_left & walled_right, axis=(1, 2))
+
+    lines = np.count_nonzero(cells.all(axis=2), axis=1)
+    if lines_cleared is not None:
+        lines = lines + np.asarray(lines_cleared)
+
+    return {
+        'column_heights': heights,
+        'max_height': heights.max(axis=1) if cols else np.zeros(count, dtype=int),
+        'aggregate_height': heights.sum(axis=1),
+        'holes': holes,
+        'bumpiness': bumpiness,
+        'row_transitions': row_transitions,
+        'column_transitions': column_transitions,
+        'wells': wells,
+        'lines_cleared': lines,
+    }
+
+
+def evaluate_batch(boards, lines_cleared=None, weights=None, cols=None):
+    """
+    Evaluate many candidate boards at once. `boards` is a list of Board objects, a list of row-bitmask
+    sequences (with the board width `cols`) or an (N, rows, cols) boolean array.
+    Returns (features, scores) where scores is the weighted sum of the features per board.
+    """
+    if len(boards) == 0:
+        return {}, np.zeros(0)
+    cells = boards if isinstance(boards, np.ndarray) else boards_to_cells(boards, cols)
+    features = board_features(cells, lines_cleared)
+    weights = DEFAULT_WEIGHTS if weights is None else weights
+    scores = np.zeros(cells.shape[0])
+    for name, weight in weights.items():
+        if weight:
+            scores += weight * features[name]
+    return features, scores
@@ -0,0 +1,65 @@
+import time
+from bot.find_best_move import expand, evaluate_boards
+
+DEFAULT_BEAM_WIDTH = 16  # Nodes kept per ply
+
+
+def beam_search(board, current, queue=(), hold=None, width=DEFAULT_BEAM_WIDTH, depth=3, profiler=None):
+    """
+    Plan several pieces ahead keeping only the `width` best nodes per ply.
+    Every ply expands all placements (with and without hold) of each node's current piece, scores the
+    children of each node in one batch and keeps the best `width` across the whole ply, up to `depth`
+    pieces or the end of the queue. Node scores are the static evaluation plus the lines cleared on the way.
+    Returns the first move (x, y, rotation, used_hold) of the best line, or None if nothing can be placed.
+    Pass a Profiler to log counters and stage timings for the decision.
+    """
+    if profiler is not None:
+        profiler.begin_decision()
+    # Beam nodes are (score, board, current piece, queue index, hold, lines cleared so far, first move)
+    beam = [(0, board, current, 0, hold, 0, None)]
+    finished = []  # Nodes whose line ran out of pieces before the last ply
+
+    for ply in range(depth):
+        candidates = []
+        for node in beam:
+            _, node_board, node_current, node_index, node_hold, node_lines, first_move = node
+            if profiler is not None:
+                start = time.perf_counter()
+            children = expand(node_board, node_current, queue, node_index, node_hold, profiler)
+            if profiler is not None:
+                now = time.perf_counter()
+                profiler.add_time('generate', now - start)
+                profiler.count('placements', len(children))
+                start = now
+            if not children:
+                continue  # Topped out, this line is dropped
+            lines = [node_lines + child[1] for child in children]
+            scores = evaluate_boards([child[0] for child in children], lines)
+            if profiler is not None:
+                profiler.add_time('evaluate', time.perf_counter() - start)
+                profiler.count('boards_evaluated', len(children))
+            for score, total_lines, (child, _, next_index, next_hold, move) in zip(scores, lines, children):
+                next_current = queue[next_index] if next_index < len(queue) else None
+                candidates.append((score, child, next_current, next_index + 1, next_hold, total_lines,
+                                   first_move if first_move is not None else move))
+
+        # Stable sort keeps generation order among equal scores, so results are deterministic
+        candidates.sort(key=lambda node: -node[0])
+        if profiler is not None and len(candidates) > width:
+            profiler.count('width_cutoffs', len(candidates) - width)
+        beam = []
+        for node in candidates[:width]:
+            if node[2] is None or ply == depth - 1:
+                finished.append(node)
+            else:
+                beam.append(node)
+        if not beam:
+            break
+
+    best_move = None
+    if finished:
+        best = max(finished, key=lambda node: node[0])  # First of the best scores wins ties
+        best_move = best[6]
+    if profiler is not None:
+        profiler.end_decision(strategy="beam", move=best_move)
+    return best_move
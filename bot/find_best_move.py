@@ -1,66 +1,374 @@
 import math
-from bot.get_possible_moves import get_possible_moves_simulate  # Import the valid moves function
+import random
+import time
+from collections import OrderedDict, namedtuple
+from bot.get_valid_moves import generate_placements  # Import the placement generator
+from bot.batch_evaluate import evaluate_batch  # Import the vectorized evaluator
+from tetris_game.piece_masks import get_piece_masks
 
-def evaluate_board(grid):
-    """Evaluate the board state and return a score."""
+DEFAULT_WIDTH = 8  # Children per node that are searched deeper
+LINE_CLEAR_SCORE = 100  # Score per cleared line
+ZOBRIST_SEED = 0x7E70  # Fixed so keys match across runs and processes
+
+_ZOBRIST_TABLES = {}  # Zobrist keys keyed by board size
+
+# Outcome of an iterative deepening decision: the move, its score, the deepest fully searched depth and nodes generated
+SearchResult = namedtuple('SearchResult', ['move', 'score', 'depth', 'nodes'])
+
+
+def evaluate_board(board, lines_cleared=0):
+    """Evaluate the board state and return a score. `lines_cleared` credits lines already removed on the way here."""
     score = 0
-    filled_lines = sum(1 for row in grid if all(cell != 0 for cell in row))
-    score += filled_lines * 100  # Score for lines cleared
+    filled_lines = board.full_lines() + lines_cleared
+    score += filled_lines * LINE_CLEAR_SCORE  # Score for lines cleared
 
     # Penalize based on the maximum height of the columns
-    column_heights = [0] * len(grid[0])
-    for x in range(len(grid[0])):
-        for y in range(len(grid)):
-            if grid[y][x] != 0:
-                column_heights[x] = len(grid) - y
-                break
-    max_height = max(column_heights)
+    max_height = max(board.column_heights())
     score -= max_height * 2  # Penalize tall stacks
 
     return score
 
-def alpha_beta_pruning(grid, depth, alpha, beta, maximizing_player, valid_moves):
-    """Perform alpha-beta pruning to find the best move."""
-    if depth == 0:
-        return evaluate_board(grid), None  # Return the score and no move
-
-    best_move = None
-
-    if maximizing_player:
-        max_eval = -math.inf
-        for x, y, rotation in valid_moves:
-            # Generate a new grid based on the move
-            new_grid = [row[:] for row in grid]
-            # Apply the move by placing the piece in `new_grid`
-            # Placeholder: replace with actual piece placement logic
-            evaluation = alpha_beta_pruning(new_grid, depth - 1, alpha, beta, False, valid_moves)[0]
-            if evaluation > max_eval:
-                max_eval = evaluation
-                best_move = (x, y, rotation)
-            alpha = max(alpha, evaluation)
-            if beta <= alpha:
-                break  # Beta cut-off
-        return max_eval, best_move
 
+def evaluate_boards(boards, lines_cleared, weights=None, cols=None):
+    """
+    Score sibling boards in one vectorized batch. `lines_cleared[i]` is credited to `boards[i]`.
+    Boards can also be given as lists of row bitmasks, together with the board width `cols`.
+    With the default weights the scores match evaluate_board.
+    """
+    return evaluate_batch(boards, lines_cleared, weights, cols)[1].tolist()
+
+
+def place_piece(board, piece_type, x, y, rotation):
+    """Copy the board, lock a piece into it and clear lines. Returns the new board and the lines cleared."""
+    new_board = board.copy()
+    new_board.lock(get_piece_masks(board.cols)[piece_type][rotation][x].rows, y, piece_type)
+    return new_board, new_board.clear_lines()
+
+
+def zobrist_keys(rows, cols):
+    """
+    Random 64-bit keys for every row and byte of a row bitmask, plus keys for the current and held piece.
+    Built once per board size from a fixed seed.
+    """
+    keys = _ZOBRIST_TABLES.get((rows, cols))
+    if keys is None:
+        rng = random.Random(ZOBRIST_SEED)
+        chunks = (cols + 7) // 8
+        row_keys = [[[rng.getrandbits(64) for _ in range(256)] for _ in range(chunks)] for _ in range(rows)]
+        piece_keys = {piece_type: rng.getrandbits(64) for piece_type in 'IOTSZJL'}
+        hold_keys = {piece_type: rng.getrandbits(64) for piece_type in 'IOTSZJL'}
+        hold_keys[None] = 0
+        keys = _ZOBRIST_TABLES[(rows, cols)] = (row_keys, piece_keys, hold_keys)
+    return keys
+
+
+def position_key(board, current, hold, queue_index):
+    """Zobrist-style hash of the board, current piece, held piece and absolute queue index."""
+    row_keys, piece_keys, hold_keys = zobrist_keys(board.rows, board.cols)
+    key = piece_keys[current] ^ hold_keys[hold]
+    for y, mask in enumerate(board.bits):
+        if mask:
+            chunk_keys = row_keys[y]
+            chunk = 0
+            while mask:
+                key ^= chunk_keys[chunk][mask & 0xFF]
+                mask >>= 8
+                chunk += 1
+    # The queue index has no fixed range, so mix it in instead of tabulating it
+    return key ^ (queue_index * 0x9E3779B97F4A7C15 & 0xFFFFFFFFFFFFFFFF)
+
+
+class TranspositionTable:
+    """
+    Bounded cache of searched positions: key -> {search: (score, best move)}, where a search is
+    (depth, width, upcoming pieces). The key does not cover the queue, so each result is filed under
+    the pieces the search could see and only returned for the same pieces: another game, or another
+    queue at the same index, never gets it. Only exact results are stored (see max_search), so a hit returns
+    what searching again would, and the deepest best move of a position is kept as a move-ordering hint.
+    When full, the least recently used position goes.
+    """
+
+    def __init__(self, max_entries=1 << 16):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def probe(self, key):
+        """Return (score, depth, move) of the deepest search of a key, without touching the counters, or None."""
+        searches = self.entries.get(key)
+        if not searches:
+            return None
+        search = max(searches, key=lambda item: item[0])
+        return searches[search][0], search[0], searches[search][1]
+
+    def lookup(self, key, search):
+        """Return (score, depth, move) for a key searched exactly as `search`, or None."""
+        searches = self.entries.get(key)
+        result = searches.get(search) if searches is not None else None
+        if result is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return result[0], search[0], result[1]
+
+    def store(self, key, search, score, move):
+        """Store the result of a search of a position; `search` is (depth, width, upcoming pieces)."""
+        entries = self.entries
+        searches = entries.get(key)
+        if searches is not None:
+            entries.move_to_end(key)
+        else:
+            if len(entries) >= self.max_entries:
+                entries.popitem(last=False)
+                self.evictions += 1
+            searches = entries[key] = {}
+        searches[search] = (score, move)
+
+    def clear(self):
+        """Forget every entry, e.g. when a new game starts."""
+        self.entries.clear()
+
+
+class SearchBudget:
+    """Caps the number of nodes and the wall-clock time spent on one decision."""
+
+    def __init__(self, max_nodes=None, time_limit=None):
+        self.max_nodes = max_nodes
+        self.deadline = time.perf_counter() + time_limit if time_limit is not None else None
+        self.nodes = 0
+
+    def exhausted(self):
+        """Check whether either limit has been reached."""
+        if self.max_nodes is not None and self.nodes >= self.max_nodes:
+            return True
+        return self.deadline is not None and time.perf_counter() >= self.deadline
+
+
+def piece_options(current, queue, queue_index, hold):
+    """
+    List the pieces a node can place: the current piece, and the piece holding brings in.
+    Returns (piece type, next queue index, next hold, used_hold) tuples.
+    """
+    options = [(current, queue_index, hold, False)]
+    if hold is None:
+        if queue_index < len(queue):
+            options.append((queue[queue_index], queue_index + 1, current, True))  # Hold pulls the next piece
+    elif hold != current:
+        options.append((hold, queue_index, current, True))  # Hold swaps with the held piece
+    return options
+
+
+def expand(board, current, queue, queue_index, hold, profiler=None):
+    """
+    List the children of a search node: every placement of the current piece, and every placement
+    reachable by holding first. Returns (board, lines cleared, next queue index, next hold, move) tuples
+    where move is (x, y, rotation, used_hold).
+    """
+    children = []
+    for piece_type, next_index, next_hold, used_hold in piece_options(current, queue, queue_index, hold):
+        for x, y, rotation, _ in generate_placements(board, piece_type, profiler=profiler):
+            child, lines = place_piece(board, piece_type, x, y, rotation)
+            children.append((child, lines, next_index, next_hold, (x, y, rotation, used_hold)))
+    return children
+
+
+def rank_children(board, current, queue, queue_index, hold, hint=None, profiler=None, width=None, budget=None):
+    """
+    Generate every child of a search node by making and unmaking placements on `board`, and rank them by
+    static evaluation (best first). The `hint` move is moved to the front if it ranks within the first
+    `width`, so a hint changes the order children are searched in but never which ones are searched.
+    Once `budget` runs out no more pieces are generated and nothing is evaluated; no children are returned.
+    Returns (children, ranked) where children are (lines cleared, next queue index, next hold, move,
+    piece rows, y) tuples and ranked is a list of (static score, child index).
+    """
+    if profiler is not None:
+        start = time.perf_counter()
+    # Make and unmake every placement on the one board, keeping only the resulting rows for evaluation
+    masks = get_piece_masks(board.cols)
+    children = []
+    child_rows = []
+    for piece_type, next_index, next_hold, used_hold in piece_options(current, queue, queue_index, hold):
+        if budget is not None and budget.exhausted():
+            break
+        for x, y, rotation, _ in generate_placements(board, piece_type, profiler=profiler):
+            piece_rows = masks[piece_type][rotation][x].rows
+            lines, record = board.place(piece_rows, y)
+            child_rows.append(board.bits if lines else board.bits[:])  # A clear leaves a fresh list behind
+            board.undo(record)
+            children.append((lines, next_index, next_hold, (x, y, rotation, used_hold), piece_rows, y))
+    if profiler is not None:
+        now = time.perf_counter()
+        profiler.add_time('generate', now - start)
+        profiler.count('placements', len(children))
+        start = now
+    if not children or budget is not None and budget.exhausted():
+        return [], []
+
+    static_scores = evaluate_boards(child_rows, [child[0] for child in children], cols=board.cols)
+    ranked = sorted(zip(static_scores, range(len(children))), key=lambda item: (-item[0], item[1]))
+    if profiler is not None:
+        profiler.add_time('evaluate', time.perf_counter() - start)
+        profiler.count('boards_evaluated', len(children))
+    if hint is not None:
+        # Search the remembered best move first
+        for position, (_, index) in enumerate(ranked[:width]):
+            if children[index][3] == hint:
+                ranked.insert(0, ranked.pop(position))
+                break
+    return children, ranked
+
+
+def max_search(board, current, queue, queue_index, hold, depth, width, budget, table=None, base_index=0,
+               profiler=None):
+    """
+    Depth-first search over placements of the known pieces, making and unmaking moves on `board`.
+    Tetris has no adversary, so every layer maximizes. Children are ranked by static evaluation and only the best `width` are searched deeper;
+    once the budget runs out the children searched so far decide. Equal scores go to the better static rank,
+    so the order children are searched in never changes the result.
+    Scores only count lines cleared below this node, so they can be cached in `table`, keyed with the
+    absolute queue index `base_index + queue_index` and filed under the pieces the search could see.
+    Only exact results are cached: complete searches
+    whose every branch went `depth` pieces deep, so the result does not depend on how much of the queue
+    is visible.
+    Returns (score, move, full depth), where full depth tells whether every branch was searched `depth` deep.
+    """
+    # Deeper than the visible queue the search cannot go, so that is the depth actually searched.
+    # Nor can holding pull a piece once the queue runs out.
+    visible_depth = len(queue) - queue_index + 1
+    full_depth = depth <= visible_depth and (hold is not None or queue_index < len(queue))
+    depth = min(depth, visible_depth)
+    key = None
+    hint = None
+    if table is not None:
+        key = position_key(board, current, hold, base_index + queue_index)
+        # Holding can pull a piece, so `depth` pieces from the queue can be reached
+        search = (depth, width, queue[queue_index:queue_index + depth])
+        if full_depth:
+            entry = table.lookup(key, search)
+            if profiler is not None:
+                profiler.count('tt_misses' if entry is None else 'tt_hits')
+            if entry is not None:
+                return entry[0], entry[2], True
+        entry = table.probe(key)
+        if entry is not None:
+            hint = entry[2]  # Best move of another search, e.g. from the previous decision
+
+    # The root always gets every child, so a decision always has a move
+    children, ranked = rank_children(board, current, queue, queue_index, hold, hint, profiler, width,
+                                     budget if queue_index else None)
+    budget.nodes += len(children)
+    if not children:
+        return -math.inf, None, full_depth  # Top out, or out of budget
+    # Static leader, kept if nothing gets searched; a hint may have been moved in front of it
+    best_score, best_index = max(ranked[:2], key=lambda item: (item[0], -item[1]))
+
+    complete = True
+    if depth > 1:
+        if profiler is not None and len(ranked) > width:
+            profiler.count('width_cutoffs', len(ranked) - width)
+        best = None  # (score, static score, -child index) of the best child searched
+        for static_score, index in ranked[:width]:
+            if budget.exhausted():
+                complete = False
+                if profiler is not None:
+                    profiler.count('budget_cutoffs')
+                break
+            lines, next_index, next_hold, _, piece_rows, y = children[index]
+            if next_index < len(queue):
+                lines, record = board.place(piece_rows, y)
+                score, _, child_full = max_search(board, queue[next_index], queue, next_index + 1, next_hold,
+                                                  depth - 1, width, budget, table, base_index, profiler)
+                board.undo(record)
+                score += lines * LINE_CLEAR_SCORE
+                full_depth = full_depth and child_full
+            else:
+                score = static_score  # No preview left to place
+                full_depth = False
+            if best is None or (score, static_score, -index) > best:
+                best = (score, static_score, -index)
+                best_score, best_index = score, index
+
+    if budget.exhausted():
+        complete = False  # The last child searched may have been cut short
+    best_move = children[best_index][3]
+    if table is not None and complete and full_depth:
+        table.store(key, search, best_score, best_move)
+    return best_score, best_move, full_depth
+
+
+def find_best_move(current_piece, board, next_queue=(), hold_piece=None, depth=3, width=DEFAULT_WIDTH,
+                   max_nodes=None, time_limit=None, table=None, queue_index=0, pool=None, profiler=None):
+    """
+    Find the best move by searching placements of the current piece and the next pieces in the queue.
+    Pass the same TranspositionTable for every piece of a game, with `queue_index` set to the absolute
+    index of next_queue[0], to reuse earlier work.
+    Pass a SearchPool to search the root placements on several cores; `time_limit` then is a hard deadline.
+    Pass a Profiler to log counters and stage timings for the decision.
+    Returns (x, y, rotation, used_hold) or None if the piece cannot be placed.
+    """
+    if profiler is not None:
+        profiler.begin_decision()
+    budget = SearchBudget(max_nodes, time_limit)
+    hold_type = hold_piece.type if hold_piece is not None else None
+    board = board.copy()  # Bits-only working copy that the search makes and unmakes moves on
+    if pool is not None:
+        best_score, best_move = pool.search(board, current_piece.type, tuple(next_queue), hold_type,
+                                            depth, width, budget, table, queue_index, profiler)
     else:
-        min_eval = math.inf
-        for x, y, rotation in valid_moves:
-            # Generate a new grid based on the move
-            new_grid = [row[:] for row in grid]
-            # Apply the move by placing the piece in `new_grid`
-            # Placeholder: replace with actual piece placement logic
-            evaluation = alpha_beta_pruning(new_grid, depth - 1, alpha, beta, True, valid_moves)[0]
-            if evaluation < min_eval:
-                min_eval = evaluation
-                best_move = (x, y, rotation)
-            beta = min(beta, evaluation)
-            if beta <= alpha:
-                break  # Alpha cut-off
-        return min_eval, best_move
-
-def find_best_move(current_piece, grid, depth=3):
-    """Find the best move using alpha-beta pruning."""
-    # Precompute all valid moves for the current piece and grid
-    valid_moves = get_possible_moves_simulate(current_piece, grid)
-    best_score, best_move = alpha_beta_pruning(grid, depth, -math.inf, math.inf, True, valid_moves)
+        best_score, best_move, _ = max_search(board, current_piece.type, tuple(next_queue), 0, hold_type,
+                                              depth, width, budget, table, queue_index, profiler)
+    if profiler is not None:
+        profiler.end_decision(strategy="search", move=best_move, score=best_score, nodes=budget.nodes)
     return best_move  # Return the best move found
+
+
+def iterative_deepening(current_piece, board, next_queue=(), hold_piece=None, max_depth=None, width=DEFAULT_WIDTH,
+                        time_limit=None, max_nodes=None, table=None, queue_index=0, pool=None, profiler=None):
+    """
+    Anytime search: search 1 piece deep, then 2, and so on through the queue until `max_depth`, the end of the
+    queue or the budget. Each iteration finds the previous iteration's best line in the transposition table
+    and searches it first. An iteration cut short by the budget is thrown away, so the move returned always
+    comes from a complete search; the 1-piece search always completes. An iteration expected to take longer
+    than the time left is not started.
+    Returns a SearchResult, whose move is None if the piece cannot be placed.
+    """
+    if profiler is not None:
+        profiler.begin_decision()
+    budget = SearchBudget(max_nodes, time_limit)
+    hold_type = hold_piece.type if hold_piece is not None else None
+    queue = tuple(next_queue)
+    board = board.copy()
+    if table is None:
+        table = TranspositionTable()  # Carries the best line from one iteration to the next
+    deepest = len(queue) + 1
+    if max_depth is not None:
+        deepest = min(deepest, max_depth)
+
+    result = SearchResult(None, -math.inf, 0, 0)
+    last_time = None  # Seconds the last complete iteration took
+    for depth in range(1, deepest + 1):
+        start = time.perf_counter()
+        nodes = budget.nodes
+        if last_time is not None and budget.deadline is not None and start + last_time * width > budget.deadline:
+            break  # An iteration costs about `width` times the last one, so this one would not finish
+        if pool is not None:
+            score, move = pool.search(board, current_piece.type, queue, hold_type, depth, width, budget, table,
+                                      queue_index, profiler)
+        else:
+            score, move, _ = max_search(board, current_piece.type, queue, 0, hold_type, depth, width, budget,
+                                        table, queue_index, profiler)
+        if depth > 1 and budget.exhausted():
+            break
+        result = SearchResult(move, score, depth, budget.nodes)
+        if budget.nodes > nodes:
+            last_time = time.perf_counter() - start  # Not if it came straight from the table
+        if move is None:
+            break  # Top out, deeper will not help
+    result = result._replace(nodes=budget.nodes)
+    if profiler is not None:
+        profiler.end_decision(strategy="anytime", move=result.move, score=result.score, depth=result.depth,
+                              nodes=result.nodes)
+    return result
@@ -1,82 +1,263 @@
-import hashlib
-from collections import deque
-from tetris_game.tetromino import Tetromino
-from tetris_game.tetris import Tetris
+from tetris_game.board import Board
+from tetris_game.events import PlacementFound
+from tetris_game.piece_masks import get_piece_masks
+from tetris_game.tetromino_data import SHAPES, WALLKICKS, I_WALLKICKS, O_WALLKICKS
 
 MAX_MOVE_SEARCH_DEPTH = 30
+ROW_OFFSET = 4  # Rows above the board a piece can reach through kicks
 
-def hash_grid(grid):
-    """Generate a unique hash for the current grid configuration."""
-    return hashlib.md5(str(grid).encode()).hexdigest()
 
-def hash_piece_position(piece):
-    """Generate a unique hash based on the piece's x, y, and rotation."""
-    return f"{piece.x},{piece.y},{piece.rotation}"
+def build_kick_offsets():
+    """
+    Convert the SRS kick tables into board offsets per piece and rotation transition.
+    Returns {piece type: {(from rotation, to rotation): ((dx, dy), ...)}} with y pointing down.
+    """
+    offsets = {}
+    for piece_type, rotations in SHAPES.items():
+        if piece_type == 'I':
+            kicks = I_WALLKICKS
+        elif piece_type == 'O':
+            kicks = O_WALLKICKS
+        else:
+            kicks = WALLKICKS
+        count = len(rotations)
+        offsets[piece_type] = {}
+        for rotation in range(count):
+            for new_rotation in ((rotation + 1) % count, (rotation - 1) % count):
+                key = f"{rotation}-{new_rotation}"
+                offsets[piece_type][(rotation, new_rotation)] = tuple(
+                    (offset_x, -offset_y) for offset_x, offset_y in kicks.get(key, []))
+    return offsets
+
+
+KICK_OFFSETS = build_kick_offsets()
+
+# Search commands in expansion order; input paths refer to them by index.
+# DAS shifts until the piece is blocked and SOFT_DROP falls until it lands; only finesse searches use them.
+COMMANDS = ('MOVE_LEFT', 'MOVE_RIGHT', 'ROTATE_CW', 'ROTATE_CCW', 'MOVE_DOWN', 'DAS_LEFT', 'DAS_RIGHT', 'SOFT_DROP')
+
+# Biases that keep the packed fields of a state key non-negative
+X_BIAS = 16
+Y_BIAS = 64
+
+_FINESSE_TABLES = {}  # Empty-board input paths keyed by (piece type, rows, cols)
+
+
+def pack_state(x, y, rotation):
+    """Pack a piece state into one integer: y in the high bits, then 8 bits of x and 2 bits of rotation."""
+    return (y + Y_BIAS) << 10 | (x + X_BIAS) << 2 | rotation
+
+
+def generate_placements(board, piece_type, x=3, y=0, rotation=0, max_depth=MAX_MOVE_SEARCH_DEPTH, profiler=None,
+                        finesse=False):
+    """
+    Breadth-first search over (x, y, rotation) states of a piece on a read-only board.
+    Every explored state is hard-dropped; placements that occupy the same cells are reported once,
+    for the first state that reaches them.
+    Returns a list of (x, y, rotation, commands) where commands is the input path ending in 'HARD_DROP'.
+    With `finesse` the search also uses DAS and soft drop inputs, so every path is as short as possible
+    counting each of those as one input. An optional Profiler counts the states expanded and the duplicate landings.
+    """
+    parents, final_states = search_states(board, piece_type, x, y, rotation, max_depth, profiler, finesse)
+    return [(final_x, drop_y, final_rotation, input_path(parents, state))
+            for final_x, drop_y, final_rotation, state in final_states]
+
+
+def input_path(parents, state):
+    """Rebuild the commands that reach a state from the parent pointers, ending in 'HARD_DROP'."""
+    commands = ['HARD_DROP']
+    link = parents[state]
+    while link != -1:
+        commands.append(COMMANDS[link & 7])
+        link = parents[link >> 3]
+    commands.reverse()
+    return commands
+
+
+def search_states(board, piece_type, x=3, y=0, rotation=0, max_depth=MAX_MOVE_SEARCH_DEPTH, profiler=None,
+                  finesse=False):
+    """
+    The search behind generate_placements(). Returns (parents, final states): parents maps every reached state
+    key to its parent key << 3 | command index (-1 for the start) in the order the states were found, and final
+    states are (x, drop y, rotation, state key) for each distinct placement.
+    """
+    masks = get_piece_masks(board.cols)[piece_type]
+    kicks = KICK_OFFSETS[piece_type]
+    rotation_count = len(masks)
+
+    # Transpose the board into one integer per column with bit (y + ROW_OFFSET) set for filled cells.
+    # The floor is solid and rows above the board are free.
+    floor = -1 << (board.rows + ROW_OFFSET)
+    column_bits = [floor] * board.cols
+    for row, row_mask in enumerate(board.bits):
+        column = 0
+        while row_mask:
+            if row_mask & 1:
+                column_bits[column] |= 1 << (row + ROW_OFFSET)
+            row_mask >>= 1
+            column += 1
+
+    # For every rotation and x, the set of y positions (shifted by ROW_OFFSET) where the piece collides
+    blocked = [{} for _ in range(rotation_count)]
+    for state_rotation in range(rotation_count):
+        for state_x, entry in masks[state_rotation].items():
+            collisions = 0
+            for row_offset, mask in entry.rows:
+                cells = 0
+                column = 0
+                while mask:
+                    if mask & 1:
+                        cells |= column_bits[column]
+                    mask >>= 1
+                    column += 1
+                collisions |= cells >> row_offset
+            blocked[state_rotation][state_x] = collisions
+
+    def fits(state_x, state_y, state_rotation):
+        collisions = blocked[state_rotation].get(state_x)
+        if collisions is None:
+            return False  # Outside the walls
+        if state_y < -ROW_OFFSET:
+            return True  # Far above the board only the walls matter
+        return not collisions >> (state_y + ROW_OFFSET) & 1
+
+    def rotate(state_x, state_y, state_rotation, new_rotation):
+        # The first kick is (0, 0), so this also covers the unkicked rotation
+        for offset_x, offset_y in kicks[(state_rotation, new_rotation)]:
+            if fits(state_x + offset_x, state_y + offset_y, new_rotation):
+                return pack_state(state_x + offset_x, state_y + offset_y, new_rotation)
+        return None
+
+    if not fits(x, y, rotation):
+        return {}, []
+
+    start = pack_state(x, y, rotation)
+    parents = {start: -1}  # State key -> parent key << 3 | command index, used to rebuild input paths
+    landed = set()  # Placement keys already reported
+    cell_shift = 4 * board.cols  # Placement key is (top row, 4-row cell mask)
+    final_states = []
+    frontier = [start]
+    depth = 0
+    expanded = 0
+
+    while frontier and depth < max_depth:
+        expanded += len(frontier)
+        next_frontier = []
+        for state in frontier:
+            state_rotation = state & 3
+            state_x = (state >> 2 & 0xFF) - X_BIAS
+            state_y = (state >> 10) - Y_BIAS
+            # Hard drop: the piece rests one row above the first collision below it
+            entry = masks[state_rotation][state_x]
+            below = blocked[state_rotation][state_x] >> (max(state_y, -ROW_OFFSET) + ROW_OFFSET + 1)
+            drop_y = max(state_y, -ROW_OFFSET) + (below & -below).bit_length() - 1
+
+            # Shifts and soft drops are plain offsets of the packed key
+            children = (
+                state - 4 if fits(state_x - 1, state_y, state_rotation) else None,
+                state + 4 if fits(state_x + 1, state_y, state_rotation) else None,
+                rotate(state_x, state_y, state_rotation, (state_rotation + 1) % rotation_count),
+                rotate(state_x, state_y, state_rotation, (state_rotation - 1) % rotation_count),
+                state + 1024 if fits(state_x, state_y + 1, state_rotation) else None,
+            )
+            if finesse:
+                left = state_x
+                while fits(left - 1, state_y, state_rotation):
+                    left -= 1
+                right = state_x
+                while fits(right + 1, state_y, state_rotation):
+                    right += 1
+                children += (
+                    state + 4 * (left - state_x) if left < state_x else None,
+                    state + 4 * (right - state_x) if right > state_x else None,
+                    state + 1024 * (drop_y - state_y) if drop_y > state_y else None,
+                )
+            for command_index, child in enumerate(children):
+                if child is not None and child not in parents:
+                    parents[child] = state << 3 | command_index
+                    next_frontier.append(child)
+
+            placement_key = (drop_y + entry.top + ROW_OFFSET) << cell_shift | entry.cells
+            if placement_key not in landed:
+                landed.add(placement_key)
+                final_states.append((state_x, drop_y, state_rotation, state))
+        frontier = next_frontier
+        depth += 1
+
+    if profiler is not None:
+        profiler.count('bfs_nodes', expanded)
+        profiler.count('duplicates_pruned', expanded - len(final_states))
+    return parents, final_states
+
+
+def finesse_table(piece_type, rows=21, cols=10):
+    """
+    Shortest input paths from the spawn state to every placement on an empty board, built once per piece
+    and board size. Equivalent rotations covering the same cells share the shortest path of any of them.
+    Returns {cells: (x, rotation, y, commands before the hard drop, rows the path needs empty)}, keyed by
+    PieceMask.cells.
+    """
+    key = (piece_type, rows, cols)
+    table = _FINESSE_TABLES.get(key)
+    if table is None:
+        masks = get_piece_masks(cols)[piece_type]
+        parents, _ = search_states(Board(rows, cols, colors=False), piece_type, finesse=True)
+        table = {}
+        # States were found in breadth-first order, so the first one covering given cells is the closest
+        for state in parents:
+            state_x = (state >> 2 & 0xFF) - X_BIAS
+            state_rotation = state & 3
+            cells = masks[state_rotation][state_x].cells
+            if cells in table:
+                continue
+            clear_rows = 0
+            link = state << 3
+            while link != -1:
+                path_state = link >> 3
+                path_y = (path_state >> 10) - Y_BIAS
+                path_entry = masks[path_state & 3][(path_state >> 2 & 0xFF) - X_BIAS]
+                clear_rows = max(clear_rows, path_y + path_entry.bottom + 1)
+                link = parents[path_state]
+            table[cells] = (state_x, state_rotation, (state >> 10) - Y_BIAS, input_path(parents, state)[:-1],
+                            clear_rows)
+        _FINESSE_TABLES[key] = table
+    return table
+
+
+def finesse_path(board, piece_type, x, y, rotation):
+    """
+    Shortest inputs that take a freshly spawned piece to the placement at (x, y, rotation), ending in
+    'HARD_DROP'. The piece may end in an equivalent rotation that covers the same cells.
+    The cached empty-board path is used when the rows it passes through are empty and its hard drop lands
+    on the placement; otherwise the board is searched. Returns None if the placement cannot be reached.
+    """
+    masks = get_piece_masks(board.cols)[piece_type]
+    entry = masks[rotation].get(x)
+    if entry is None:
+        return None
+    cached = finesse_table(piece_type, board.rows, board.cols).get(entry.cells)
+    if cached is not None:
+        path_x, path_rotation, path_y, commands, clear_rows = cached
+        if not any(board.bits[:clear_rows]):
+            path_entry = masks[path_rotation][path_x]
+            if path_y + path_entry.top + board.drop_distance(path_entry, path_y) == y + entry.top:
+                return commands + ['HARD_DROP']
+
+    target = (y + entry.top, entry.cells)
+    for found_x, found_y, found_rotation, commands in generate_placements(board, piece_type, finesse=True):
+        found = masks[found_rotation][found_x]
+        if (found_y + found.top, found.cells) == target:
+            return commands
+    return None
+
 
-def get_possible_moves_simulate(current_piece, grid):
+def get_possible_moves_simulate(current_piece, board, events=None):
     """
-    Simulate all possible moves for the current Tetromino in the given grid.
-    Returns x, y, and rotation for each possible final position.
+    Simulate all possible moves for the current Tetromino on the given board.
+    Returns x, y, and rotation for each possible final position, reporting each one to `events` if given.
     """
-    explored_piece_positions = set()  # Deduplicate piece positions
-    arrived_at_boards = set()  # Deduplicate hard-dropped boards
-    bfs_queue = deque([(current_piece.clone(), [], grid)])  # Each item is (piece, commands, grid)
-    possible_moves = []
-
-    # Create a Tetris game instance to simulate moves
-    tetris_game = Tetris(rows=len(grid), cols=len(grid[0]), block_size=30, window_width=600, window_height=800)
-    tetris_game.grid = grid  # Set the initial grid
-
-    while bfs_queue:
-        piece, commands, current_grid = bfs_queue.popleft()
-
-        # Skip already explored piece positions
-        pos_hash = hash_piece_position(piece)
-        if pos_hash in explored_piece_positions:
-            continue
-        explored_piece_positions.add(pos_hash)
-
-        # Execute all commands (left, right, rotate, soft drop), but reserve hard drop as the final move
-        if len(commands) < MAX_MOVE_SEARCH_DEPTH:
-            for command in ['MOVE_LEFT', 'MOVE_RIGHT', 'ROTATE_CW', 'ROTATE_CCW', 'MOVE_DOWN']:
-                # Simulate the Tetris game for this move
-                new_tetris_game = Tetris(rows=len(current_grid), cols=len(current_grid[0]), block_size=30, window_width=600, window_height=800)
-                new_tetris_game.grid = [row[:] for row in current_grid]  # Deep copy of the grid
-                new_piece = piece.clone()  # Clone the current piece
-                new_tetris_game.current_piece = new_piece  # Assign the cloned piece
-
-                # Execute the command using Tetris methods
-                if command == 'MOVE_LEFT':
-                    new_tetris_game.move_left()
-                elif command == 'MOVE_RIGHT':
-                    new_tetris_game.move_right()
-                elif command == 'MOVE_DOWN':
-                    new_tetris_game.move_down()  # Soft drop
-                elif command == 'ROTATE_CW':
-                    new_tetris_game.rotate_cw()
-                elif command == 'ROTATE_CCW':
-                    new_tetris_game.rotate_ccw()
-
-                # Append the result to the queue for further exploration
-                bfs_queue.append((new_tetris_game.current_piece, commands + [command], new_tetris_game.grid))
-
-        # Simulate hard drop as the last move
-        if len(commands) < MAX_MOVE_SEARCH_DEPTH:
-            new_tetris_game = Tetris(rows=len(current_grid), cols=len(current_grid[0]), block_size=30, window_width=600, window_height=800)
-            new_tetris_game.grid = [row[:] for row in current_grid]  # Deep copy of the grid
-            new_piece = piece.clone()  # Clone the current piece
-            new_tetris_game.current_piece = new_piece  # Assign the cloned piece
-            
-            # Perform hard drop using the Tetris method
-            new_tetris_game.hard_drop()  # This will move the piece down and lock it in place
-
-            # Check if the board after the hard drop is unique
-            board_hash = hash_grid(new_tetris_game.grid)
-            if board_hash not in arrived_at_boards:
-                arrived_at_boards.add(board_hash)
-                # Print the commands leading to this move and the final position
-                print(f"Commands: {commands + ['HARD_DROP']}")
-                print(f"Final position: x={new_piece.x}, y={new_piece.y}, rotation={new_piece.rotation}")
-                possible_moves.append((new_piece.x, new_piece.y, new_piece.rotation))
-
-    return possible_moves
+    placements = generate_placements(board, current_piece.type, current_piece.x, current_piece.y, current_piece.rotation)
+    if events is not None and events.subscribers:
+        for x, y, rotation, _ in placements:
+            events.emit(PlacementFound(current_piece.type, x, y, rotation))
+    return [(x, y, rotation) for x, y, rotation, _ in placements]
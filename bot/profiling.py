@@ -0,0 +1,74 @@
+import json
+import time
+
+# Counters collected per decision
+COUNTERS = (
+    'bfs_nodes',  # Piece states expanded by the placement search
+    'duplicates_pruned',  # Expanded states whose hard drop landed on a placement already found
+    'placements',  # Placements generated (search children)
+    'boards_evaluated',  # Boards scored by the evaluator
+    'tt_hits',  # Transposition table lookups that returned a result
+    'tt_misses',
+    'width_cutoffs',  # Children left unsearched because they ranked outside the width
+    'budget_cutoffs',  # Nodes whose remaining children were skipped because the budget ran out
+)
+# Wall-clock stages per decision; 'decision' is the whole call and contains the others
+STAGES = ('generate', 'evaluate', 'decision')
+
+
+class Profiler:
+    """
+    Opt-in counters and stage timers for bot decisions. Pass one to find_best_move, iterative_deepening or
+    beam_search; without one the search only pays for a few `is not None` checks.
+    Every decision is written as a JSON line to `sink` (any writable text file) and added to the game totals,
+    which finish() writes as a summary.
+    """
+
+    def __init__(self, sink=None):
+        self.sink = sink
+        self.decisions = 0
+        self.totals = dict.fromkeys(COUNTERS, 0)
+        self.total_seconds = dict.fromkeys(STAGES, 0.0)
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.seconds = dict.fromkeys(STAGES, 0.0)
+        self._start = None
+
+    def count(self, name, amount=1):
+        self.counters[name] += amount
+
+    def add_time(self, stage, seconds):
+        self.seconds[stage] += seconds
+
+    def begin_decision(self):
+        """Reset the per-decision counters and start the decision timer."""
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.seconds = dict.fromkeys(STAGES, 0.0)
+        self._start = time.perf_counter()
+
+    def end_decision(self, **info):
+        """Stop the decision timer, add the decision to the totals and log it. `info` is added to the record."""
+        self.seconds['decision'] = time.perf_counter() - self._start
+        for name, value in self.counters.items():
+            self.totals[name] += value
+        for stage, seconds in self.seconds.items():
+            self.total_seconds[stage] += seconds
+        record = {'decision': self.decisions, **info, 'counters': self.counters, 'seconds': self.seconds}
+        self.decisions += 1
+        self.write(record)
+        return record
+
+    def summary(self):
+        """Totals over every decision so far, with the mean decision time in milliseconds."""
+        mean_ms = 1000 * self.total_seconds['decision'] / self.decisions if self.decisions else 0.0
+        return {'decisions': self.decisions, 'counters': dict(self.totals), 'seconds': dict(self.total_seconds),
+                'mean_decision_ms': mean_ms}
+
+    def finish(self):
+        """Log the game summary and return it."""
+        summary = self.summary()
+        self.write({'summary': summary})
+        return summary
+
+    def write(self, record):
+        if self.sink is not None:
+            self.sink.write(json.dumps(record) + "\n")
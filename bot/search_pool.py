@@ -0,0 +1,152 @@
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from bot.find_best_move import (rank_children, max_search, position_key, zobrist_keys, SearchBudget,
+                                TranspositionTable, LINE_CLEAR_SCORE)
+from tetris_game.board import Board
+from tetris_game.piece_masks import get_piece_masks
+
+_worker_table = None  # Transposition table of a worker process, kept across decisions
+
+
+def _init_worker(rows, cols):
+    """Build the piece and Zobrist tables once when a worker starts, so no decision pays for them."""
+    global _worker_table
+    get_piece_masks(cols)
+    zobrist_keys(rows, cols)
+    _worker_table = TranspositionTable()
+
+
+def _ready():
+    return os.getpid()
+
+
+def _search_child(bits, rows, cols, current, queue, queue_index, hold, depth, width, max_nodes, deadline,
+                  base_index):
+    """
+    Search one root child in a worker. `deadline` is a time.time() value shared with the parent process.
+    Returns (score, nodes, complete, full depth), or None if the deadline passed before the search started.
+    """
+    time_limit = None
+    if deadline is not None:
+        time_limit = deadline - time.time()
+        if time_limit <= 0:
+            return None
+    board = Board(rows, cols, colors=False)
+    board.bits = list(bits)
+    board.recount()
+    budget = SearchBudget(max_nodes, time_limit)
+    score, _, full_depth = max_search(board, current, queue, queue_index, hold, depth, width, budget, _worker_table,
+                                      base_index)
+    return score, budget.nodes, not budget.exhausted(), full_depth
+
+
+class SearchPool:
+    """
+    Persistent worker processes that search the root placements of a decision in parallel.
+    Workers are started and their tables built when the pool is created, and each keeps its own
+    transposition table between decisions. A table only ever returns what searching again would, so the
+    worker tables change how fast a decision is made, never the move. Close the pool (or use it as a
+    context manager) when done.
+    """
+
+    def __init__(self, workers=None, rows=21, cols=10):
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker, initargs=(rows, cols))
+        # Start every worker now rather than on the first decision
+        for future in [self.executor.submit(_ready) for _ in range(self.workers)]:
+            future.result()
+
+    def close(self):
+        self.executor.shutdown(cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def search(self, board, current, queue, hold, depth, width, budget, table=None, base_index=0, profiler=None):
+        """
+        Root-split version of max_search(): the same children are ranked the same way, and each of the best
+        `width` is searched in a worker. Search is max-only, so there is no bound for siblings to share.
+        Children unfinished at the budget's deadline are dropped and the best finished one is returned;
+        with no deadline the result is the same as max_search(). `budget.max_nodes` caps each child's search.
+        A profiler only sees the root here; the workers do not report their counters.
+        Returns (score, move).
+        """
+        full_depth = depth <= len(queue) + 1 and (hold is not None or len(queue) > 0)
+        depth = min(depth, len(queue) + 1)
+        key = None
+        hint = None
+        if table is not None:
+            key = position_key(board, current, hold, base_index)
+            search = (depth, width, queue[:depth])
+            if full_depth:
+                entry = table.lookup(key, search)
+                if profiler is not None:
+                    profiler.count('tt_misses' if entry is None else 'tt_hits')
+                if entry is not None:
+                    return entry[0], entry[2]
+            entry = table.probe(key)
+            if entry is not None:
+                hint = entry[2]
+
+        children, ranked = rank_children(board, current, queue, 0, hold, hint, profiler, width)
+        budget.nodes += len(children)
+        if not children:
+            return -math.inf, None  # Top out
+        # Static leader, kept if nothing gets searched; a hint may have been moved in front of it
+        best_score, best_index = max(ranked[:2], key=lambda item: (item[0], -item[1]))
+
+        complete = True
+        if depth > 1:
+            # The budget's deadline is on perf_counter, which other processes cannot read
+            deadline = None
+            if budget.deadline is not None:
+                deadline = time.time() + budget.deadline - time.perf_counter()
+            if profiler is not None and len(ranked) > width:
+                profiler.count('width_cutoffs', len(ranked) - width)
+            results = []  # (score, static score, -child index)
+            futures = {}
+            for static_score, index in ranked[:width]:
+                _, next_index, next_hold, _, piece_rows, y = children[index]
+                if next_index < len(queue):
+                    lines, record = board.place(piece_rows, y)
+                    bits = board.bits[:]
+                    board.undo(record)
+                    future = self.executor.submit(_search_child, bits, board.rows, board.cols, queue[next_index],
+                                                  queue, next_index + 1, next_hold, depth - 1, width,
+                                                  budget.max_nodes, deadline, base_index)
+                    futures[future] = (static_score, index, lines)
+                else:
+                    results.append((static_score, static_score, -index))  # No preview left to place
+                    full_depth = False
+
+            timeout = None if deadline is None else max(0.0, deadline - time.time())
+            done, pending = wait(futures, timeout=timeout)
+            for future in pending:
+                future.cancel()
+            complete = not pending
+            for future in done:
+                static_score, index, lines = futures[future]
+                result = future.result()
+                if result is None:
+                    complete = False
+                    continue
+                score, nodes, child_complete, child_full = result
+                budget.nodes += nodes
+                complete = complete and child_complete
+                full_depth = full_depth and child_full
+                results.append((score + lines * LINE_CLEAR_SCORE, static_score, -index))
+
+            if results:
+                # Better static ranks win ties, as in the sequential search
+                best_score, _, best_index = max(results)
+                best_index = -best_index
+
+        best_move = children[best_index][3]
+        if table is not None and complete and full_depth:
+            table.store(key, search, best_score, best_move)
+        return best_score, best_move
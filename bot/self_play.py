@@ -0,0 +1,179 @@
+import argparse
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from bot.get_valid_moves import generate_placements
+from bot.find_best_move import find_best_move, TranspositionTable
+from bot.beam_search import beam_search, DEFAULT_BEAM_WIDTH
+from bot.profiling import Profiler
+from tetris_game.engine import TetrisEngine, PREVIEW_COUNT
+from tetris_game.gravity import Gravity
+from tetris_game.piece_masks import get_piece_masks
+
+DEFAULT_MAX_PIECES = 500  # Pieces per game before it is stopped
+
+
+def choose_move(game, strategy, rng, depth, beam_width, max_nodes, table, profiler=None):
+    """Pick (x, y, rotation, used_hold) for the current piece with the given strategy, or None if there is no move."""
+    if strategy == "search":
+        return find_best_move(game.current_piece, game.board, game.next_queue.peek(PREVIEW_COUNT), game.hold_piece,
+                              depth=depth, max_nodes=max_nodes, table=table, queue_index=game.queue_index,
+                              profiler=profiler)
+    if strategy == "beam":
+        hold_type = game.hold_piece.type if game.hold_piece is not None else None
+        return beam_search(game.board, game.current_piece.type, game.next_queue.peek(PREVIEW_COUNT), hold_type,
+                           width=beam_width, depth=depth, profiler=profiler)
+    placements = generate_placements(game.board, game.current_piece.type)
+    if not placements:
+        return None
+    x, y, rotation, _ = rng.choice(placements)
+    return x, y, rotation, False
+
+
+def reachable(game, x, y, rotation):
+    """Check that the current piece can still reach the placement from where it is now."""
+    piece = game.current_piece
+    masks = get_piece_masks(game.cols)[piece.type]
+    target = masks[rotation][x]
+    for found_x, found_y, found_rotation, _ in generate_placements(game.board, piece.type, piece.x, piece.y,
+                                                                   piece.rotation):
+        found = masks[found_rotation][found_x]
+        if found_y + found.top == y + target.top and found.cells == target.cells:
+            return True
+    return False
+
+
+def play_game(seed, strategy="search", depth=2, beam_width=DEFAULT_BEAM_WIDTH, max_nodes=None,
+              max_pieces=DEFAULT_MAX_PIECES, profile=False, level=None):
+    """
+    Play one headless game from `seed` until top-out or `max_pieces` and return its result as a dict.
+    Searches are limited by node count rather than time so the same seed always plays the same game.
+    With `profile` the result also holds the Profiler summary of the game's decisions.
+    With a gravity `level` the game runs in real time: while the bot decides, the piece falls and may lock.
+    A decision is late, and the piece is dropped where it is, when the piece locked or can no longer reach
+    the chosen placement; the result counts late pieces. Such games depend on the speed of the machine.
+    """
+    start = time.perf_counter()
+    game = TetrisEngine(seed=seed)
+    rng = random.Random(seed)  # Only used by the "random" strategy
+    table = TranspositionTable() if strategy == "search" else None
+    profiler = Profiler() if profile else None
+    game_time = [0.0]  # Seconds of bot thinking, the clock gravity runs on
+    gravity = Gravity(game, level, clock=lambda: game_time[0]) if level is not None else None
+    pieces = 0
+    late = 0
+    topped_out = False
+    while pieces < max_pieces:
+        decision_start = time.perf_counter()
+        move = choose_move(game, strategy, rng, depth, beam_width, max_nodes, table, profiler)
+        if move is None:
+            topped_out = True
+            break
+        x, y, rotation, used_hold = move
+        if gravity is not None:
+            piece = game.current_piece
+            game_time[0] += time.perf_counter() - decision_start
+            gravity.update()
+            if game.current_piece is not piece or not (used_hold or reachable(game, x, y, rotation)):
+                late += 1
+                if game.current_piece is piece:
+                    game.hard_drop()
+                pieces += 1
+                if game.game_over:
+                    topped_out = True
+                    break
+                continue
+        game.apply_placement(x, y, rotation, used_hold)
+        pieces += 1
+        if game.game_over:
+            topped_out = True  # The next piece has no room to spawn
+            break
+
+    result = {
+        'seed': seed,
+        'pieces': pieces,
+        'lines': game.lines_cleared,
+        'attack': game.score,  # Sum of calculate_score over every clear
+        'topped_out': topped_out,
+        'seconds': time.perf_counter() - start,
+    }
+    if gravity is not None:
+        result['level'] = level
+        result['late'] = late
+    if profiler is not None:
+        result['profile'] = profiler.summary()
+    return result
+
+
+def run_games(seeds, workers=None, chunksize=None, **config):
+    """
+    Play one game per seed across `workers` processes (all cores by default, 1 to stay in this process)
+    and yield each result as soon as it is ready, in seed order. `config` is passed to play_game().
+    Results depend only on the seeds and config, never on the worker count.
+    """
+    seeds = list(seeds)
+    play = partial(play_game, **config)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        yield from map(play, seeds)
+        return
+
+    if chunksize is None:
+        chunksize = max(1, len(seeds) // (workers * 4))  # A few chunks per worker keeps them evenly loaded
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(play, seeds, chunksize=chunksize)
+
+
+def summarize(results, seconds):
+    """Aggregate per-game results into totals, averages and throughput over `seconds` of wall time."""
+    games = len(results)
+    pieces = sum(result['pieces'] for result in results)
+    summary = {
+        'games': games,
+        'pieces': pieces,
+        'lines': sum(result['lines'] for result in results),
+        'attack': sum(result['attack'] for result in results),
+        'top_outs': sum(result['topped_out'] for result in results),
+        'mean_pieces': pieces / games if games else 0,
+        'seconds': seconds,
+        'games_per_sec': games / seconds if seconds else 0,
+        'pieces_per_sec': pieces / seconds if seconds else 0,
+    }
+    if any('late' in result for result in results):
+        summary['late'] = sum(result['late'] for result in results)
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play seeded headless bot games in parallel.")
+    parser.add_argument('--games', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=0, help="seed of the first game, the others follow it")
+    parser.add_argument('--workers', type=int, default=None, help="processes to use (default: all cores)")
+    parser.add_argument('--chunksize', type=int, default=None)
+    parser.add_argument('--strategy', choices=("search", "beam", "random"), default="search")
+    parser.add_argument('--depth', type=int, default=2)
+    parser.add_argument('--beam-width', type=int, default=DEFAULT_BEAM_WIDTH)
+    parser.add_argument('--max-nodes', type=int, default=None)
+    parser.add_argument('--max-pieces', type=int, default=DEFAULT_MAX_PIECES)
+    parser.add_argument('--profile', action='store_true', help="add search counters and stage timings per game")
+    parser.add_argument('--level', type=int, default=None,
+                        help="play in real time at this gravity level and count decisions too late to place")
+    args = parser.parse_args(argv)
+
+    seeds = range(args.seed, args.seed + args.games)
+    start = time.perf_counter()
+    results = []
+    # One JSON line per game as it finishes, then the summary
+    for result in run_games(seeds, args.workers, args.chunksize, strategy=args.strategy, depth=args.depth,
+                            beam_width=args.beam_width, max_nodes=args.max_nodes, max_pieces=args.max_pieces,
+                            profile=args.profile, level=args.level):
+        results.append(result)
+        print(json.dumps(result), flush=True)
+    print(json.dumps(summarize(results, time.perf_counter() - start)))
+
+
+if __name__ == "__main__":
+    main()
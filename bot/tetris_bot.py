@@ -1,121 +1,164 @@
-import sys
-import os
-import time
-import pygame
 import random  # Import random for selecting a random valid move
-from bot.get_valid_moves import get_possible_moves_simulate  # Import the valid moves function
-
-# Add the path to the tetris_game directory to the system path
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../tetris_game')))
-
-from tetris import Tetris  # Import the Tetris game class
+from bot.get_valid_moves import get_possible_moves_simulate, finesse_path  # Import the valid moves functions
+from bot.find_best_move import find_best_move, iterative_deepening, TranspositionTable  # Import the lookahead search
+from bot.beam_search import beam_search, DEFAULT_BEAM_WIDTH  # Import the beam search planner
+from tetris_game.engine import TetrisEngine, PREVIEW_COUNT  # Headless rules, no pygame needed to decide moves
+from tetris_game.events import MaxMovesReached
 
 class TetrisBot:
-    def __init__(self, max_moves=10):
-        self.game_state = Tetris()  # Initialize a new Tetris game state
+    def __init__(self, max_moves=10, strategy="random", depth=3, time_limit=None, beam_width=DEFAULT_BEAM_WIDTH,
+                 preview=PREVIEW_COUNT, search_pool=None, profiler=None, use_inputs=True, game_state=None):
+        # Pass a Tetris instance to watch the bot play (see tetris_game.tetris.spectate); the default is headless
+        self.game_state = game_state if game_state is not None else TetrisEngine()
         self.move_count = 0  # Counter for the number of moves made
         self.active = True  # Flag to control whether the bot is active
         self.max_moves = max_moves  # Set maximum moves allowed
-        self.max_moves_reached_printed = False  # Flag to print maximum moves message only once
         self.valid_moves = []  # Store valid moves for random selection
-
-    def print_board(self, grid):
-        """Print the last four rows of a given grid to the console."""
-        print("Current Board (last four rows):")
-        for row in grid[-4:]:  # Only print the last four rows
-            print(' '.join(str(cell) if cell != 0 else '.' for cell in row))
-        print("\n")
-
-    def print_all_moves(self):
-        """Print all valid moves found for the current Tetromino."""
-        if not self.valid_moves:
-            print("No valid moves to display.")
-            return
-
-        print(f"Number of valid moves found: {len(self.valid_moves)}")
-        for i, (x, y, rotation) in enumerate(self.valid_moves):
-            print(f"Move {i + 1}/{len(self.valid_moves)}: Place piece at ({x}, {y}) with rotation {rotation}")
-        print()  # Blank line for separation
+        self.strategy = strategy  # "random", "search" or "beam"
+        self.depth = depth  # Pieces searched ahead by the "search" and "beam" strategies
+        self.time_limit = time_limit  # Seconds per "search" decision; with a limit the search deepens until it runs out
+        self.transposition_table = TranspositionTable()  # Shared by every decision of this game
+        self.table_game = None  # (seed, queue index) of the last search, to notice when the game is reset
+        self.beam_width = beam_width  # Nodes kept per ply by the "beam" strategy
+        self.preview = preview  # Upcoming pieces the "search" and "beam" strategies may look at
+        self.search_pool = search_pool  # Optional SearchPool to spread each "search" decision over several cores
+        self.profiler = profiler  # Optional Profiler that logs every decision and the game summary
+        self.use_inputs = use_inputs  # Play moves as finesse input sequences instead of teleporting the piece
+        self.last_inputs = None  # Inputs of the last move, None if it was teleported
 
     def random_move(self):
-        """Select a random move from valid moves and print the move number."""
-        self.valid_moves = get_possible_moves_simulate(self.game_state.current_piece, self.game_state.grid)  # Get valid moves using simulation
+        """Select a random move from valid moves."""
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.begin_decision()
+        self.valid_moves = get_possible_moves_simulate(self.game_state.current_piece, self.game_state.board,
+                                                       self.game_state.events)  # Get valid moves using simulation
+        move = None
         if self.valid_moves:  # Ensure there are valid moves
-            move_index = random.randint(0, len(self.valid_moves) - 1)  # Select a random index
-            x, y, rotation = self.valid_moves[move_index]
-            
-            # Print the selected move with its number out of total valid moves
-            print(f"Random move selected: Place piece at ({x}, {y}) with rotation {rotation} ({move_index + 1}/{len(self.valid_moves)})")
-            return x, y, rotation
+            move = self.valid_moves[random.randint(0, len(self.valid_moves) - 1)]  # Select a random move
+        if profiler is not None:
+            profiler.count('placements', len(self.valid_moves))
+            profiler.end_decision(strategy="random", move=move)
+        if move is None:
+            return None, None, None
+        return move
+
+    def search_move(self):
+        """Select a move by searching ahead over the next queue, holding first if the search says so."""
+        game = self.game_state
+        last = self.table_game
+        if last is not None and (game.seed != last[0] or game.queue_index < last[1]):
+            self.transposition_table.clear()  # A new game: nothing from the last one is any use
+        self.table_game = (game.seed, game.queue_index)
+        if self.time_limit is not None:
+            # Anytime search: as deep as the time limit allows, `depth` at most
+            move = iterative_deepening(game.current_piece, game.board, game.next_queue.peek(self.preview),
+                                       game.hold_piece, max_depth=self.depth, time_limit=self.time_limit,
+                                       table=self.transposition_table, queue_index=game.queue_index,
+                                       pool=self.search_pool, profiler=self.profiler).move
         else:
-            print("No valid moves available.")
+            move = find_best_move(game.current_piece, game.board, game.next_queue.peek(self.preview),
+                                  game.hold_piece, depth=self.depth, table=self.transposition_table,
+                                  queue_index=game.queue_index, pool=self.search_pool, profiler=self.profiler)
+        if move is None:
+            return None, None, None
+
+        x, y, rotation, used_hold = move
+        if used_hold:
+            game.hold()
+        return x, y, rotation
+
+    def beam_move(self):
+        """Select a move with beam search over the next queue, holding first if the best line does."""
+        game = self.game_state
+        hold_type = game.hold_piece.type if game.hold_piece is not None else None
+        move = beam_search(game.board, game.current_piece.type, game.next_queue.peek(self.preview), hold_type,
+                           width=self.beam_width, depth=self.depth, profiler=self.profiler)
+        if move is None:
             return None, None, None
 
+        x, y, rotation, used_hold = move
+        if used_hold:
+            game.hold()
+        return x, y, rotation
+
     def make_move(self):
         if self.move_count < self.max_moves:  # Use the max_moves variable
-            # Print the current board state first
-            self.print_board(self.game_state.grid)
-
-            x, y, rotation = self.random_move()  # Get a random move
+            if self.strategy == "search":
+                x, y, rotation = self.search_move()  # Get the best move found by searching ahead
+            elif self.strategy == "beam":
+                x, y, rotation = self.beam_move()  # Get the first move of the best beam line
+            else:
+                x, y, rotation = self.random_move()  # Get a random move
             if x is not None and y is not None:  # Ensure the move is valid
-                # Set the current piece's position and rotation
                 current_piece = self.game_state.current_piece
+                self.last_inputs = None
+                if self.use_inputs:
+                    # Shortest key presses to the placement; the hard drop locks it and spawns the next piece
+                    self.last_inputs = finesse_path(self.game_state.board, current_piece.type, x, y, rotation)
+                if self.last_inputs is not None:
+                    for command in self.last_inputs:
+                        self.game_state.press(command)
+                    self.move_count += 1  # Increment move counter
+                    return
+
+                # No input path (or inputs disabled): set the current piece's position and rotation
+                spawn = (current_piece.x, current_piece.y, current_piece.rotation)
                 current_piece.rotation = rotation
+                current_piece.shape = current_piece.shape_data[rotation]
                 current_piece.x = x
                 current_piece.y = y  # Move to the calculated position
 
-                # Check for collision at the final position before locking the piece
-                if y >= 0 and not current_piece.check_collision(self.game_state.grid):
-                    # Lock the piece after moving
+                # Check for collision at the final position before locking the piece. Rows above the board are
+                # fine: locking a piece entirely up there tops out.
+                if not current_piece.check_collision(self.game_state.board):
                     self.game_state.lock_piece()
-                    self.game_state.next_piece()   # Get the next piece after locking
-                    
-                    self.move_count += 1  # Increment move counter
-
-                    # Print all valid configurations after the move
-                    self.print_all_moves()
-                    
-                    # Print the current board state after the move
-                    self.print_board(self.game_state.grid)
-                    
-                    time.sleep(1)  # Delay to visualize the move
-                    self.draw()  # Draw the current game state
+                    self.game_state.next_piece()  # Get the next piece after locking
                 else:
-                    print(f"Collision detected, cannot place piece at ({x}, {y}).")
-            else:
-                print("No valid moves available.")
+                    # Not a free placement. Searching again would pick it again, so hard drop from the spawn instead
+                    current_piece.x, current_piece.y, current_piece.rotation = spawn
+                    current_piece.shape = current_piece.shape_data[current_piece.rotation]
+                    self.game_state.hard_drop()
+                self.move_count += 1  # Increment move counter
+            elif not self.game_state.game_over:
+                self.game_state.top_out()  # No placement for the piece: reported as a top-out on the event stream
         else:
-            if not self.max_moves_reached_printed:
-                print("Maximum moves reached. Bot will stop placing pieces.")
-                self.max_moves_reached_printed = True  # Set the flag to prevent multiple prints
-            self.active = False  # Stop the bot's activity
-
-    def draw(self):
-        """Draw the current game state on the screen."""
-        screen.fill((0, 0, 0))  # Clear the screen
-        self.game_state.draw(screen)  # Call the draw method of Tetris to render the game state
-        pygame.display.flip()  # Update the display
+            events = self.game_state.events
+            if self.active and events.subscribers:
+                events.emit(MaxMovesReached(self.move_count))
+            self.stop()
+
+    def stop(self):
+        """Stop the bot's activity, logging the profiler's game summary the first time."""
+        if self.active and self.profiler is not None:
+            self.profiler.finish()  # Game summary
+        self.active = False
+
+    def step(self):
+        """Make one move and report whether the bot is still playing; the step function of a Simulation."""
+        if self.active:
+            self.make_move()
+        if self.game_state.game_over:
+            self.stop()  # Topped out, or no placement for the piece
+        return self.active
 
 # Example usage
 if __name__ == "__main__":
+    import pygame
+    from tetris_game.tetris import Tetris, spectate  # Import the Tetris game class and the viewer loop
+    from tetris_game.simulation import Simulation
+    from tetris_game.events import print_event, PieceLocked, LinesCleared, ToppedOut
+
     pygame.init()
     window_width, window_height = 600, 21 * 30  # Same size as your main game window
     screen = pygame.display.set_mode((window_width, window_height))
     pygame.display.set_caption("Tetris Bot Visualization")
 
-    bot = TetrisBot(max_moves=10)  # Set the maximum moves allowed
-
-    running = True
-    while running and not bot.game_state.game_over:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-        bot.make_move()  # The bot attempts to make a move
+    bot = TetrisBot(max_moves=10, game_state=Tetris())  # Set the maximum moves allowed
+    bot.game_state.events.subscribe(print_event, PieceLocked, LinesCleared, ToppedOut,
+                                    MaxMovesReached)  # Log the game to the console
 
-    # Keep the window open after the bot stops placing pieces
-    while bot.active:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                bot.active = False
+    # The bot plays one piece per second in its own thread; the window keeps drawing at 60 FPS until closed
+    spectate(screen, bot.game_state, Simulation(bot.game_state, bot.step, rate=1))
 
     pygame.quit()
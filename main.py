@@ -1,5 +1,8 @@
+import argparse
 import pygame
-from tetris_game.tetris import Tetris
+from bot.tetris_bot import TetrisBot
+from tetris_game.simulation import Simulation
+from tetris_game.tetris import Tetris, spectate
 
 # Initialize the game window
 pygame.init()
@@ -13,12 +16,11 @@ clock = pygame.time.Clock()
 # Initialize the game
 game = Tetris()
 
-def game_loop():
+def game_loop(level=1):
+    game.set_level(level)  # Gravity and lock delay; None for pieces that only fall on input
     running = True
 
     while running:
-        screen.fill((0, 0, 0))  # Clear the screen
-
         # Get the current key state
         key_input = pygame.key.get_pressed()
 
@@ -32,11 +34,9 @@ def game_loop():
         # Update the game state based on player input and events
         game.update(key_input, event_list)
 
-        # Render the game
-        game.draw(screen)
-
-        # Update the display
-        pygame.display.flip()
+        # Render what changed and update only those parts of the display
+        dirty_rects = game.draw(screen)
+        pygame.display.update(dirty_rects)
 
         # Control the game speed (e.g., 60 frames per second)
         clock.tick(60)
@@ -44,5 +44,24 @@ def game_loop():
     pygame.quit()
 
 
+def watch_bot(strategy, rate, pieces, depth):
+    """Watch a bot play: it runs at `rate` pieces per second (None for flat out) while the window draws at 60 FPS."""
+    bot = TetrisBot(max_moves=pieces, strategy=strategy, depth=depth, game_state=game)
+    spectate(screen, game, Simulation(game, bot.step, rate))
+    pygame.quit()
+
+
 if __name__ == '__main__':
-    game_loop()
+    parser = argparse.ArgumentParser(description="Play Tetris, or watch a bot play it.")
+    parser.add_argument('--bot', choices=('random', 'search', 'beam'), default=None,
+                        help="watch a bot with this strategy play instead of playing yourself")
+    parser.add_argument('--rate', type=float, default=None, help="bot pieces per second (default: as fast as it can)")
+    parser.add_argument('--pieces', type=int, default=1000, help="pieces the bot plays")
+    parser.add_argument('--depth', type=int, default=2, help="pieces the bot searches ahead")
+    parser.add_argument('--level', type=int, default=1, help="gravity level when playing (0 for no gravity)")
+    args = parser.parse_args()
+
+    if args.bot:
+        watch_bot(args.bot, args.rate, args.pieces, args.depth)
+    else:
+        game_loop(args.level or None)
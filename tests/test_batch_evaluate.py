@@ -0,0 +1,71 @@
+import random
+import pytest
+from benchmarks.fixtures import BOARDS, make_board
+from bot.batch_evaluate import evaluate_batch
+from bot.find_best_move import evaluate_board, evaluate_boards, place_piece
+from bot.get_valid_moves import generate_placements
+from tetris_game.board import Board
+
+FEATURES = ('holes', 'bumpiness', 'row_transitions', 'column_transitions', 'wells')
+
+
+def naive_features(grid):
+    """The evaluation features counted cell by cell. Walls and the floor count as filled."""
+    rows, cols = len(grid), len(grid[0])
+
+    def filled(y, x):
+        return x < 0 or x >= cols or y >= rows or grid[y][x] != 0
+
+    heights = []
+    for x in range(cols):
+        height = 0
+        for y in range(rows):
+            if grid[y][x]:
+                height = rows - y
+                break
+        heights.append(height)
+    return {
+        'column_heights': heights,
+        'holes': sum(1 for x in range(cols) for y in range(rows - heights[x], rows) if not grid[y][x]),
+        'bumpiness': sum(abs(heights[x] - heights[x + 1]) for x in range(cols - 1)),
+        'row_transitions': sum(filled(y, x) != filled(y, x + 1) for y in range(rows) for x in range(-1, cols)),
+        'column_transitions': sum(filled(y, x) != filled(y + 1, x) for y in range(rows) for x in range(cols)),
+        'wells': sum(1 for x in range(cols) for y in range(rows - heights[x])
+                     if filled(y, x - 1) and filled(y, x + 1)),
+    }
+
+
+def random_boards(seed, count):
+    rng = random.Random(seed)
+    boards = []
+    for _ in range(count):
+        board = Board(colors=False)
+        for y in range(board.rows - rng.randrange(board.rows), board.rows):
+            board.bits[y] = rng.getrandbits(board.cols)
+        board.recount()
+        boards.append(board)
+    return boards
+
+
+def children(name):
+    board = make_board(name)
+    return [place_piece(board, piece, x, y, rotation)[0]
+            for piece in 'IOTSZJL' for x, y, rotation, _ in generate_placements(board, piece)]
+
+
+@pytest.mark.parametrize('boards', [random_boards(0, 150), random_boards(1, 150)] +
+                         [children(name) for name in BOARDS], ids=['random0', 'random1'] + list(BOARDS))
+def test_features_match_cell_by_cell_counts(boards):
+    features, _ = evaluate_batch(boards)
+    for i, board in enumerate(boards):
+        expected = naive_features(board.grid)
+        assert features['column_heights'][i].tolist() == expected['column_heights']
+        assert {name: int(features[name][i]) for name in FEATURES} == {name: expected[name] for name in FEATURES}
+
+
+def test_default_scores_match_evaluate_board():
+    boards = children('quad') + random_boards(2, 50)
+    lines = [i % 3 for i in range(len(boards))]
+    assert evaluate_boards(boards, lines) == [evaluate_board(board, n) for board, n in zip(boards, lines)]
+    # Row bitmasks score the same as the boards they come from
+    assert evaluate_boards([board.bits for board in boards], lines, cols=10) == evaluate_boards(boards, lines)
@@ -0,0 +1,71 @@
+import random
+import pytest
+from tetris_game.board import Board
+from tetris_game.piece_masks import get_piece_masks
+
+
+def scanned_drop_distance(board, entry, y):
+    distance = 0
+    while not board.collides(entry.rows, y + distance + 1):
+        distance += 1
+    return distance
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_drop_distance_matches_row_scan_from_above_the_board(seed):
+    rng = random.Random(seed)
+    board = Board(colors=False)
+    for y in range(board.rows - rng.randrange(8), board.rows):
+        board.bits[y] = rng.getrandbits(board.cols) & ~(1 << rng.randrange(board.cols))
+    board.recount()
+    for piece_type, rotations in get_piece_masks(board.cols).items():
+        for masks in rotations:
+            for entry in masks.values():
+                for y in range(-4, board.rows):
+                    if not board.collides(entry.rows, y):
+                        assert board.drop_distance(entry, y) == scanned_drop_distance(board, entry, y)
+
+
+def state(board):
+    return (board.bits[:], [row[:] for row in board.cells], board.fill[:], board.heights[:], board.column_counts[:])
+
+
+def recounted(board):
+    copy = board.copy()
+    copy.recount()
+    return copy.fill, copy.heights, copy.column_counts
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_random_place_and_undo(seed):
+    # A narrow board with rows one cell short of full, so many placements clear lines
+    rng = random.Random(seed)
+    board = Board(14, 6)
+    for y in range(8, 14):
+        board.bits[y] = board.full_row & ~(1 << rng.randrange(6))
+        board.cells[y] = ['G' if board.bits[y] >> x & 1 else 0 for x in range(6)]
+    board.recount()
+    masks = get_piece_masks(board.cols)
+    history = []  # (state before the place, undo record)
+    cleared = 0
+    for _ in range(400):
+        if history and (rng.random() < 0.4 or max(board.heights) > 10):
+            before, record = history.pop()
+            board.undo(record)
+            assert state(board) == before
+            continue
+        piece_type = rng.choice('IOTSZJL')
+        entry = rng.choice(list(rng.choice(masks[piece_type]).values()))
+        y = -4 + board.drop_distance(entry, -4)
+        before = state(board)
+        lines, record = board.place(entry.rows, y, piece_type)
+        cleared += lines
+        history.append((before, record))
+        assert (board.fill, board.heights, board.column_counts) == recounted(board)
+        assert [[cell != 0 for cell in row] for row in board.cells] == \
+            [[mask >> x & 1 == 1 for x in range(board.cols)] for mask in board.bits]
+    while history:
+        before, record = history.pop()
+        board.undo(record)
+        assert state(board) == before
+    assert cleared
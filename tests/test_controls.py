@@ -0,0 +1,84 @@
+import math
+import pygame
+from tetris_game.controls import Controls
+from tetris_game.engine import TetrisEngine
+
+
+def keys(left=False, right=False, down=False):
+    return {pygame.K_LEFT: left, pygame.K_RIGHT: right, pygame.K_DOWN: down}
+
+
+def press(key):
+    return [pygame.event.Event(pygame.KEYDOWN, key=key)]
+
+
+def hold_right(controls, game, until, step):
+    """Hold right from time 0 to `until`, one update every `step` seconds."""
+    controls.update(keys(right=True), press(pygame.K_RIGHT), game, now=0.0)
+    for frame in range(1, int(until / step) + 1):
+        controls.update(keys(right=True), [], game, now=frame * step)
+
+
+def test_das_then_arr():
+    game = TetrisEngine(seed=0)
+    controls = Controls(das=0.1, arr=0.02)
+    start = game.current_piece.x
+    controls.update(keys(right=True), press(pygame.K_RIGHT), game, now=0.0)
+    assert game.current_piece.x == start + 1  # Moves once on the press
+    controls.update(keys(right=True), [], game, now=0.09)
+    assert game.current_piece.x == start + 1  # DAS still charging
+    controls.update(keys(right=True), [], game, now=0.1)
+    assert game.current_piece.x == start + 2
+    controls.update(keys(right=True), [], game, now=0.145)
+    assert game.current_piece.x == start + 4  # Two more auto-repeats due by 0.14
+
+
+def test_movement_does_not_depend_on_the_frame_rate():
+    positions = []
+    for step in (1 / 30, 1 / 60, 1 / 144):
+        game = TetrisEngine(seed=0)
+        game.current_piece.x = 0
+        hold_right(Controls(das=0.1, arr=0.05), game, 0.24, step)
+        positions.append(game.current_piece.x)
+    assert positions == [positions[0]] * 3 and positions[0] == 4  # Press, DAS at 0.1, repeats at 0.15 and 0.2
+
+
+def test_zero_arr_shifts_to_the_wall():
+    game = TetrisEngine(seed=0)
+    controls = Controls(das=0.1, arr=0)
+    hold_right(controls, game, 0.2, 0.1)
+    assert game.shift_distance(1) == 0
+
+
+def test_last_pressed_direction_wins_and_release_falls_back():
+    game = TetrisEngine(seed=0)
+    controls = Controls(das=0.1, arr=0.05)
+    start = game.current_piece.x
+    controls.update(keys(left=True), press(pygame.K_LEFT), game, now=0.0)
+    controls.update(keys(left=True, right=True), press(pygame.K_RIGHT), game, now=0.05)
+    assert game.current_piece.x == start and controls.direction == 1
+    controls.update(keys(left=True), [], game, now=0.08)  # Right released: left charges DAS afresh
+    assert controls.direction == -1
+    controls.update(keys(left=True), [], game, now=0.17)
+    assert game.current_piece.x == start
+    controls.update(keys(left=True), [], game, now=0.18)
+    assert game.current_piece.x == start - 1
+
+
+def test_soft_drop_factor():
+    game = TetrisEngine(seed=0)
+    controls = Controls(soft_drop_factor=20, base_drop_rate=1.0)  # 20 rows per second
+    piece = game.current_piece
+    controls.update(keys(down=True), press(pygame.K_DOWN), game, now=0.0)
+    assert piece.y == 1  # One row on the press
+    controls.update(keys(down=True), [], game, now=0.2)
+    assert piece.y == 5
+    controls.update(keys(), [], game, now=1.0)
+    assert piece.y == 5 and controls.next_drop is None
+
+
+def test_infinite_soft_drop_reaches_the_floor():
+    game = TetrisEngine(seed=0)
+    controls = Controls(soft_drop_factor=math.inf)
+    controls.update(keys(down=True), [], game, now=0.0)
+    assert game.drop_distance() == 0 and game.board.fill[-1] == 0  # On the floor, not locked
@@ -0,0 +1,108 @@
+import random
+import pytest
+from bot.find_best_move import max_search, SearchBudget
+from bot.get_valid_moves import generate_placements
+from tetris_game.engine import TetrisEngine, PREVIEW_COUNT
+from tetris_game.events import PieceLocked
+from tetris_game.piece_masks import get_piece_masks
+from tetris_game.tetromino import Tetromino
+
+
+def random_stack(game, rng):
+    for y in range(game.rows):
+        if rng.random() < 0.5:
+            game.board.bits[y] = rng.getrandbits(game.cols)
+    game.board.recount()
+
+
+def cells_free(game, direction):
+    """Shift distance by trying one cell after another."""
+    piece = game.current_piece
+    masks = get_piece_masks(game.cols)[piece.type][piece.rotation]
+    distance = 0
+    while True:
+        entry = masks.get(piece.x + direction * (distance + 1))
+        if entry is None or game.board.collides(entry.rows, piece.y):
+            return distance
+        distance += 1
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_shift_distance_matches_cell_by_cell_moves(seed):
+    rng = random.Random(seed)
+    game = TetrisEngine(seed=seed)
+    checked = 0
+    while checked < 200:
+        random_stack(game, rng)
+        piece = Tetromino(rng.choice('IOTSZJL'))
+        piece.rotation = rng.randrange(4)
+        piece.shape = piece.shape_data[piece.rotation]
+        masks = get_piece_masks(game.cols)[piece.type][piece.rotation]
+        piece.x = rng.choice(list(masks))
+        piece.y = rng.randrange(-3, game.rows)
+        if game.board.collides(masks[piece.x].rows, piece.y):
+            continue
+        game.current_piece = piece
+        for direction in (-1, 1):
+            distance = cells_free(game, direction)
+            assert game.shift_distance(direction) == distance
+            assert game.shift_distance(direction, 1) == min(1, distance)
+        checked += 1
+
+
+def test_piece_locked_keeps_the_board_of_its_lock():
+    game = TetrisEngine(seed=0)
+    events = []
+    game.events.subscribe(events.append, PieceLocked)
+    for _ in range(3):
+        game.hard_drop()
+    first = events[0].grid
+    assert sum(cell != 0 for row in first for cell in row) == 4
+    assert first != events[-1].grid
+    with pytest.raises(TypeError):
+        first[-1][0] = 'T'
+
+
+def game_state(game):
+    piece = game.current_piece
+    held = game.hold_piece
+    return (game.board.bits[:], [row[:] for row in game.board.cells], game.board.fill[:], game.board.heights[:],
+            game.board.column_counts[:], piece.type, piece.x, piece.y, piece.rotation,
+            held.type if held else None, game.hold_used, tuple(game.next_queue.peek(PREVIEW_COUNT + 2)),
+            game.queue_index, game.combo, game.last_was_b2b, game.score, game.lines_cleared,
+            game.last_move_was_rotation, game.game_over)
+
+
+def explore(game, rng, depth):
+    """Apply a few placements, with and without hold, searching deeper below each, and undo them again."""
+    if depth == 0 or game.game_over:
+        return
+    for use_hold in (False, True):
+        if not use_hold:
+            piece_type = game.current_piece.type
+        elif game.hold_piece:
+            piece_type = game.hold_piece.type
+        else:
+            piece_type = game.next_queue.peek(1)[0]
+        placements = generate_placements(game.board, piece_type)
+        for x, y, rotation, _ in rng.sample(placements, min(2, len(placements))):
+            before = game_state(game)
+            record = game.apply_placement(x, y, rotation, use_hold)
+            explore(game, rng, depth - 1)
+            game.undo(record)
+            assert game_state(game) == before
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_nested_apply_placement_and_undo_restore_the_game(seed):
+    rng = random.Random(seed)
+    game = TetrisEngine(seed=seed)
+    for _ in range(25):
+        if game.game_over:
+            break
+        explore(game, rng, 3)
+        hold = game.hold_piece.type if game.hold_piece else None
+        _, move, _ = max_search(game.board.copy(), game.current_piece.type, tuple(game.next_queue.peek(3)), 0,
+                                hold, 2, 3, SearchBudget())
+        game.apply_placement(*move)
+    assert game.lines_cleared
@@ -0,0 +1,64 @@
+import pytest
+from bot.find_best_move import iterative_deepening, max_search, rank_children, SearchBudget, TranspositionTable
+from tetris_game.engine import TetrisEngine
+
+
+def play(seed, pieces, preview, depth, width, table):
+    """Play a seeded game with the search and return every decision's (score, move)."""
+    game = TetrisEngine(seed=seed)
+    decisions = []
+    for _ in range(pieces):
+        if game.game_over:
+            break
+        hold = game.hold_piece.type if game.hold_piece else None
+        score, move, _ = max_search(game.board.copy(), game.current_piece.type, tuple(game.next_queue.peek(preview)),
+                                    0, hold, depth, width, SearchBudget(), table, game.queue_index)
+        decisions.append((score, move))
+        if move is None:
+            break
+        x, y, rotation, used_hold = move
+        game.apply_placement(x, y, rotation, used_hold)
+    return decisions
+
+
+@pytest.mark.parametrize('seed', [1, 2])
+@pytest.mark.parametrize('preview, depth', [(1, 2), (2, 3), (5, 3)])
+def test_table_does_not_change_decisions(seed, preview, depth):
+    # Cached results must be what a fresh search would return, however much of the queue each decision saw
+    fresh = play(seed, 8, preview, depth, 3, None)
+    table = TranspositionTable()
+    assert play(seed, 8, preview, depth, 3, table) == fresh
+    # Playing the game again finds the decisions in the table
+    hits = table.hits
+    assert play(seed, 8, preview, depth, 3, table) == fresh
+    assert table.hits > hits
+
+
+def test_search_cut_short_by_the_queue_is_not_reused():
+    # With one piece visible, holding the T pulls the I and leaves nothing to search after it
+    game = TetrisEngine(seed=0)
+    board = game.board.copy()
+    table = TranspositionTable()
+    max_search(board, 'T', ('I',), 0, None, 2, 3, SearchBudget(), table)
+    longer = max_search(board, 'T', ('I', 'O'), 0, None, 2, 3, SearchBudget(), table)
+    assert longer == max_search(board, 'T', ('I', 'O'), 0, None, 2, 3, SearchBudget())
+
+
+def test_hold_with_an_empty_queue_is_not_reused():
+    # With no piece visible, holding cannot bring in the I that a longer queue shows
+    board = TetrisEngine(seed=0).board.copy()
+    table = TranspositionTable()
+    max_search(board, 'T', (), 0, None, 1, 3, SearchBudget(), table)
+    longer = max_search(board, 'T', ('I',), 0, None, 1, 3, SearchBudget(), table)
+    assert longer == max_search(board, 'T', ('I',), 0, None, 1, 3, SearchBudget())
+
+
+def test_no_children_are_generated_out_of_budget():
+    board = TetrisEngine(seed=0).board.copy()
+    assert rank_children(board, 'T', ('I',), 0, None, budget=SearchBudget(time_limit=0)) == ([], [])
+
+
+def test_out_of_time_still_gives_the_1_piece_move():
+    game = TetrisEngine(seed=0)
+    result = iterative_deepening(game.current_piece, game.board, game.next_queue.peek(5), time_limit=0)
+    assert result.depth == 1 and result.move is not None
@@ -0,0 +1,110 @@
+import json
+import os
+import pytest
+from bot.get_valid_moves import generate_placements, get_possible_moves_simulate, finesse_path, finesse_table
+from tetris_game.board import Board
+from tetris_game.engine import TetrisEngine
+from tetris_game.piece_masks import get_piece_masks
+from tetris_game.tetromino import Tetromino
+
+# Placements found by the original Tetris-object BFS (baseline commit) on seeded random stacks with holes and
+# overhangs, for every piece. The first board is empty.
+with open(os.path.join(os.path.dirname(__file__), 'data', 'original_bfs_placements.json')) as f:
+    RECORDED = json.load(f)
+
+
+def make_board(bits):
+    board = Board(RECORDED['rows'], RECORDED['cols'], colors=False)
+    board.bits = list(bits)
+    board.recount()
+    return board
+
+
+CASES = [(index, piece) for index, board in enumerate(RECORDED['boards']) for piece in board['placements']]
+
+
+@pytest.mark.parametrize('index, piece', CASES)
+def test_generate_placements_matches_original_bfs(index, piece):
+    recorded = RECORDED['boards'][index]
+    board = make_board(recorded['bits'])
+    placements = generate_placements(board, piece)
+    assert [[x, y, rotation] for x, y, rotation, _ in placements] == recorded['placements'][piece]
+
+
+@pytest.mark.parametrize('index, piece', CASES)
+def test_get_possible_moves_simulate_matches_original_bfs(index, piece):
+    recorded = RECORDED['boards'][index]
+    moves = get_possible_moves_simulate(Tetromino(piece), make_board(recorded['bits']))
+    assert [list(move) for move in moves] == recorded['placements'][piece]
+
+
+@pytest.mark.parametrize('index', [0, 5, 17])
+def test_input_paths_reach_their_placements(index):
+    board = make_board(RECORDED['boards'][index]['bits'])
+    masks = get_piece_masks(board.cols)
+    for piece in 'IOTSZJL':
+        for x, y, rotation, commands in generate_placements(board, piece):
+            game = TetrisEngine(board.rows, board.cols, seed=0)
+            game.board = board.copy(colors=True)
+            game.current_piece = Tetromino(piece)
+            for command in commands[:-1]:
+                game.press(command)
+            landed = game.current_piece
+            landed_y = landed.y + game.drop_distance()
+            found = masks[piece][landed.rotation][landed.x]
+            target = masks[piece][rotation][x]
+            assert (landed_y + found.top, found.cells) == (y + target.top, target.cells)
+
+
+def searched_paths(board, piece):
+    """Shortest path to each placement found by searching the board, keyed like a finesse_path target."""
+    masks = get_piece_masks(board.cols)[piece]
+    paths = {}
+    for x, y, rotation, commands in generate_placements(board, piece, finesse=True):
+        found = masks[rotation][x]
+        paths.setdefault((y + found.top, found.cells), commands)
+    return paths
+
+
+@pytest.mark.parametrize('index', [0, 5, 17, 20])
+def test_finesse_paths_reach_their_placements(index):
+    board = make_board(RECORDED['boards'][index]['bits'])
+    masks = get_piece_masks(board.cols)
+    for piece in 'IOTSZJL':
+        for x, y, rotation, _ in generate_placements(board, piece):
+            commands = finesse_path(board, piece, x, y, rotation)
+            assert commands[-1] == 'HARD_DROP'
+            game = TetrisEngine(board.rows, board.cols, seed=0)
+            game.board = board.copy(colors=True)
+            game.current_piece = Tetromino(piece)
+            for command in commands[:-1]:
+                game.press(command)
+            landed = game.current_piece
+            found = masks[piece][landed.rotation][landed.x]
+            target = masks[piece][rotation][x]
+            assert (landed.y + game.drop_distance() + found.top, found.cells) == (y + target.top, target.cells)
+
+
+def test_cached_finesse_paths_match_the_search():
+    board = make_board(RECORDED['boards'][0]['bits'])  # Empty, so every path comes from the table
+    masks = get_piece_masks(board.cols)
+    for piece in 'IOTSZJL':
+        assert len(finesse_table(piece, board.rows, board.cols)) == len(searched_paths(board, piece))
+        for target, commands in searched_paths(board, piece).items():
+            top, cells = target
+            for rotation, by_x in enumerate(masks[piece]):
+                for x, entry in by_x.items():
+                    if entry.cells == cells:
+                        assert finesse_path(board, piece, x, top - entry.top, rotation) == commands
+
+
+def test_finesse_path_searches_when_the_cached_path_is_blocked():
+    board = Board(21, 10, colors=False)
+    board.bits[3] = 0b0111111111  # A ledge the cached paths would pass through, open at the right wall
+    board.recount()
+    masks = get_piece_masks(board.cols)['I']
+    paths = searched_paths(board, 'I')
+    for x, y, rotation, _ in generate_placements(board, 'I'):
+        entry = masks[rotation][x]
+        assert finesse_path(board, 'I', x, y, rotation) == paths[(y + entry.top, entry.cells)]
+    assert any(y > 3 for _, y, _, _ in generate_placements(board, 'I'))  # Some placements are under the ledge
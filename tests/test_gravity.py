@@ -0,0 +1,65 @@
+import pytest
+from tetris_game.engine import TetrisEngine
+from tetris_game.gravity import Gravity, gravity_for_level, FRAME_RATE, MAX_GRAVITY
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_gravity_curve():
+    assert gravity_for_level(1) == pytest.approx(1 / FRAME_RATE)  # One row per second
+    speeds = [gravity_for_level(level) for level in range(1, 21)]
+    assert speeds == sorted(speeds)
+    assert speeds[-1] == MAX_GRAVITY
+
+
+def test_level_1_falls_a_row_per_second_by_the_clock():
+    clock = Clock()
+    game = TetrisEngine(seed=1)
+    gravity = Gravity(game, level=1, clock=clock)
+    piece = game.current_piece
+    clock.now = 3.0
+    assert gravity.update() == 3 * FRAME_RATE
+    assert piece.y == 3
+    assert gravity.update() == 0  # Nothing more is due until the clock moves
+
+
+def test_grounded_piece_locks_after_the_lock_delay():
+    game = TetrisEngine(seed=1)
+    gravity = Gravity(game, gravity=MAX_GRAVITY, lock_delay=0.5)
+    piece = game.current_piece
+    gravity.advance(1)
+    assert game.drop_distance() == 0  # 20G lands the piece on its first frame
+    gravity.advance(FRAME_RATE // 2 - 2)
+    assert game.current_piece is piece
+    gravity.advance(1)
+    assert game.current_piece is not piece and game.board.fill[-1] > 0
+
+
+def test_moves_on_the_ground_restart_the_lock_delay_up_to_the_limit():
+    game = TetrisEngine(seed=1)
+    gravity = Gravity(game, gravity=MAX_GRAVITY, lock_delay=0.5, move_reset_limit=4)
+    piece = game.current_piece
+    gravity.advance(1)
+    moves = 0
+    while game.current_piece is piece:
+        game.shift(1 if moves % 2 == 0 else -1)  # Back and forth on the ground
+        gravity.advance(FRAME_RATE // 3)  # Less than the lock delay each time
+        moves += 1
+    assert moves == 4
+    assert gravity.frame < 5 * FRAME_RATE // 2
+
+
+def test_game_ends_when_pieces_reach_the_top():
+    game = TetrisEngine(seed=1)
+    gravity = Gravity(game, gravity=MAX_GRAVITY, lock_delay=1 / FRAME_RATE)
+    gravity.advance(10 * FRAME_RATE)
+    assert game.game_over
+    frame = gravity.frame
+    gravity.advance(5)  # Frames still count, but nothing moves any more
+    assert gravity.frame == frame + 5
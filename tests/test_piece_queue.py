@@ -0,0 +1,49 @@
+from tetris_game.piece_queue import PieceQueue, BAG
+
+
+def take(queue, count):
+    return [queue.pop() for _ in range(count)]
+
+
+def test_same_seed_same_pieces():
+    assert take(PieceQueue(42), 50) == take(PieceQueue(42), 50)
+    assert take(PieceQueue(42), 50) != take(PieceQueue(43), 50)
+
+
+def test_every_bag_holds_each_piece_once():
+    pieces = take(PieceQueue(7), 7 * 20)
+    for start in range(0, len(pieces), 7):
+        assert sorted(pieces[start:start + 7]) == sorted(BAG)
+
+
+def test_peek_does_not_take_pieces():
+    queue = PieceQueue(3)
+    preview = queue.peek(12)  # Past the end of the first bag
+    assert queue.index == 0
+    assert take(queue, 12) == preview
+    assert queue.index == 12
+
+
+def test_seek_matches_popping_from_the_start():
+    pieces = take(PieceQueue(11), 60)
+    for index in (0, 5, 7, 13, 41):
+        queue = PieceQueue(11)
+        queue.seek(index)
+        assert queue.index == index
+        assert take(queue, 60 - index) == pieces[index:]
+
+
+def test_seek_backwards():
+    queue = PieceQueue(11)
+    pieces = take(queue, 30)
+    queue.seek(9)
+    assert queue.peek(21) == pieces[9:]
+
+
+def test_unpop_restores_the_order():
+    queue = PieceQueue(5)
+    expected = queue.peek(10)
+    taken = take(queue, 3)
+    queue.unpop(taken)
+    assert queue.index == 0
+    assert take(queue, 10) == expected
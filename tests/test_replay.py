@@ -0,0 +1,78 @@
+import pytest
+from bot.find_best_move import find_best_move
+from bot.get_valid_moves import generate_placements
+from tetris_game.engine import TetrisEngine
+from tetris_game.replay import Replay, ReplayWriter
+
+
+def game_state(game):
+    return (game.board.bits[:], [row[:] for row in game.grid], game.score, game.lines_cleared, game.combo, game.last_was_b2b,
+            game.current_piece.type, game.hold_piece.type if game.hold_piece else None,
+            game.next_queue.peek(10), game.queue_index, game.game_over)
+
+
+@pytest.fixture(scope='module')
+def recorded(tmp_path_factory):
+    """A searched game recorded with keyframes every 16 pieces, with the state before every piece and each path."""
+    game = TetrisEngine(seed=77)
+    writer = ReplayWriter(game, keyframe_interval=16)
+    states, paths = [], []
+    for _ in range(70):
+        move = find_best_move(game.current_piece, game.board, game.next_queue.peek(5), game.hold_piece, depth=2,
+                              width=4)
+        if game.game_over or move is None:
+            break
+        states.append(game_state(game))
+        x, y, rotation, used_hold = move
+        if used_hold:
+            piece = game.hold_piece.type if game.hold_piece else game.next_queue.peek(1)[0]
+        else:
+            piece = game.current_piece.type
+        path = next(commands for px, py, pr, commands in generate_placements(game.board, piece)
+                    if (px, py, pr) == (x, y, rotation))
+        if used_hold:
+            path = ['HOLD'] + path
+        writer.play(x, y, rotation, used_hold, path)
+        paths.append(path)
+    states.append(game_state(game))
+    path = tmp_path_factory.mktemp('replay') / 'game.tkrp'
+    writer.save(path)
+    assert game.lines_cleared and any(path[0] == 'HOLD' for path in paths)
+    return path, states, paths
+
+
+def test_every_state_is_reached_by_seeking(recorded):
+    path, states, _ = recorded
+    with Replay(path) as replay:
+        assert len(replay) == len(states) - 1
+        # Out of order, so seeks go backwards and across keyframes
+        for index in sorted(range(len(states)), key=lambda index: (index * 37) % len(states)):
+            assert game_state(replay.state_at(index)) == states[index]
+
+
+def test_placements_and_inputs_decode(recorded):
+    path, states, paths = recorded
+    with Replay(path) as replay:
+        for index, expected in enumerate(paths):
+            assert replay.inputs(index) == expected
+            x, y, rotation, used_hold = replay.placement(index)
+            assert used_hold == (expected[0] == 'HOLD')
+        with pytest.raises(IndexError):
+            replay.placement(len(replay))
+        with pytest.raises(IndexError):
+            replay.state_at(len(replay) + 1)
+
+
+def test_empty_replay_has_the_starting_state(tmp_path):
+    game = TetrisEngine(seed=3)
+    ReplayWriter(game).save(tmp_path / 'empty.tkrp')
+    with Replay(tmp_path / 'empty.tkrp') as replay:
+        assert len(replay) == 0
+        assert game_state(replay.state_at(0)) == game_state(game)
+
+
+def test_other_files_are_rejected(tmp_path):
+    path = tmp_path / 'not_a_replay'
+    path.write_bytes(bytes(64))
+    with pytest.raises(ValueError):
+        Replay(path)
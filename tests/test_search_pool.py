@@ -0,0 +1,49 @@
+import pytest
+from benchmarks.fixtures import make_board
+from bot.find_best_move import max_search, SearchBudget, TranspositionTable
+from bot.search_pool import SearchPool
+from tetris_game.engine import TetrisEngine
+
+
+@pytest.fixture(scope='module')
+def pool():
+    with SearchPool(workers=2) as pool:
+        yield pool
+
+
+@pytest.mark.parametrize('seed', [4, 5])
+def test_pool_matches_sequential_search_with_persistent_tables(pool, seed):
+    # Both searches keep their tables across the game, as TetrisBot does. The sequential table also holds
+    # deeper searches of the same positions, which must not stand in for the searches asked for.
+    game = TetrisEngine(seed=seed)
+    table = TranspositionTable()
+    pool_table = TranspositionTable()
+    for _ in range(10):
+        if game.game_over:
+            break
+        hold = game.hold_piece.type if game.hold_piece else None
+        queue = tuple(game.next_queue.peek(3))
+        max_search(game.board.copy(), game.current_piece.type, queue, 0, hold, 4, 3, SearchBudget(), table,
+                   game.queue_index)
+        sequential = max_search(game.board.copy(), game.current_piece.type, queue, 0, hold, 3, 3, SearchBudget(),
+                                table, game.queue_index)[:2]
+        parallel = pool.search(game.board.copy(), game.current_piece.type, queue, hold, 3, 3, SearchBudget(),
+                               pool_table, game.queue_index)
+        assert parallel == sequential
+        if sequential[1] is None:
+            break
+        game.apply_placement(*sequential[1])
+
+
+def test_pool_tables_are_not_reused_for_other_queues(pool):
+    # One pool and one table see the same boards and queue indices with different queues
+    table = TranspositionTable()
+    pool_table = TranspositionTable()
+    queues = [('J', 'T', 'O'), ('S', 'Z', 'I'), ('T', 'T', 'L'), ('J', 'T', 'O')]
+    for name in ('messy', 'example', 'quad'):
+        for queue in queues:
+            for current, hold in (('I', None), ('L', 'S')):
+                board = make_board(name).copy()
+                fresh = max_search(board, current, queue, 0, hold, 3, 3, SearchBudget())[:2]
+                assert max_search(board, current, queue, 0, hold, 3, 3, SearchBudget(), table)[:2] == fresh
+                assert pool.search(board, current, queue, hold, 3, 3, SearchBudget(), pool_table) == fresh
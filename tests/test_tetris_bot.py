@@ -0,0 +1,61 @@
+import io
+import json
+import random
+from bot.profiling import Profiler
+from bot.tetris_bot import TetrisBot
+from tetris_game.engine import TetrisEngine
+from tetris_game.events import MaxMovesReached
+
+
+def test_profiler_summary_when_the_game_ends():
+    random.seed(0)
+    sink = io.StringIO()
+    bot = TetrisBot(max_moves=1000, game_state=TetrisEngine(seed=0), profiler=Profiler(sink))
+    while bot.step():
+        pass
+    assert bot.game_state.game_over
+    bot.step()  # Stopped bots do not write the summary again
+    records = [json.loads(line) for line in sink.getvalue().splitlines()]
+    assert ['summary' in record for record in records].count(True) == 1
+    assert 'summary' in records[-1]
+
+
+def play_search(bot, moves):
+    placed = []
+    for _ in range(moves):
+        bot.step()
+        placed.append(bot.game_state.board.bits[:])
+    return placed
+
+
+def test_search_table_is_cleared_when_the_game_is_reset():
+    bot = TetrisBot(max_moves=100, strategy="search", depth=2, game_state=TetrisEngine(seed=1))
+    play_search(bot, 3)
+    bot.game_state.reset_board_and_bag(seed=2)
+    fresh = TetrisBot(max_moves=100, strategy="search", depth=2, game_state=TetrisEngine(seed=2))
+    assert play_search(bot, 1) == play_search(fresh, 1)
+    # Only what the new game searched is left
+    assert set(bot.transposition_table.entries) == set(fresh.transposition_table.entries)
+    assert play_search(bot, 3) == play_search(fresh, 3)
+
+
+def test_teleport_into_the_stack_falls_back_to_a_hard_drop():
+    game = TetrisEngine(seed=0)
+    bot = TetrisBot(max_moves=10, use_inputs=False, game_state=game)
+    bot.random_move = lambda: (3, game.rows, 0)  # Below the floor
+    piece = game.current_piece.type
+    bot.step()
+    assert bot.move_count == 1 and game.queue_index == 2
+    assert game.board.fill[-1] > 0 and piece in game.board.cells[-1]
+
+
+def test_move_limit_is_reported_on_the_event_stream(capsys):
+    game = TetrisEngine(seed=0)
+    events = []
+    game.events.subscribe(events.append, MaxMovesReached)
+    bot = TetrisBot(max_moves=2, game_state=game)
+    while bot.step():
+        pass
+    bot.step()
+    assert events == [MaxMovesReached(2)]
+    assert capsys.readouterr().out == ''
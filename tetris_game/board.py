@@ -0,0 +1,209 @@
+class Board:
+    """
+    Bitboard representation of the playfield.
+    Each row is an integer bitmask where bit x is set when column x is filled.
+    Piece colors live in a separate `cells` layer that only rendering reads;
+    headless copies made by the bot leave it as None.
+    Column heights, filled cells per column and filled cells per row are kept up to date on every
+    lock and clear, so evaluation never rescans the board.
+    """
+
+    def __init__(self, rows=21, cols=10, colors=True):
+        self.rows = rows
+        self.cols = cols
+        self.full_row = (1 << cols) - 1  # Bitmask of a completely filled row
+        self.bits = [0] * rows
+        self.cells = [[0 for _ in range(cols)] for _ in range(rows)] if colors else None
+        self.heights = [0] * cols  # Height of each column measured from the floor
+        self.column_counts = [0] * cols  # Filled cells in each column
+        self.fill = [0] * rows  # Filled cells in each row
+
+    @classmethod
+    def from_grid(cls, grid):
+        """Build a board from a list-of-lists grid of piece letters (0 for empty)."""
+        board = cls(len(grid), len(grid[0]))
+        for y, row in enumerate(grid):
+            mask = 0
+            for x, value in enumerate(row):
+                if value != 0:
+                    mask |= 1 << x
+            board.bits[y] = mask
+            board.cells[y] = list(row)
+        board.recount()
+        return board
+
+    def recount(self):
+        """Rebuild the maintained features from the bits, after the bits were changed directly."""
+        self.fill = [bin(mask).count('1') for mask in self.bits]
+        self.heights = [0] * self.cols
+        self.column_counts = [0] * self.cols
+        for x in range(self.cols):
+            self._rescan_column(x)
+
+    def _rescan_column(self, x):
+        """Recompute the height and filled-cell count of one column."""
+        height = 0
+        count = 0
+        for y, mask in enumerate(self.bits):
+            if mask >> x & 1:
+                if not height:
+                    height = self.rows - y
+                count += 1
+        self.heights[x] = height
+        self.column_counts[x] = count
+
+    def copy(self, colors=False):
+        """Copy the board. The color layer is only copied when asked for."""
+        board = Board.__new__(Board)
+        board.rows = self.rows
+        board.cols = self.cols
+        board.full_row = self.full_row
+        board.bits = self.bits[:]
+        board.cells = [row[:] for row in self.cells] if colors and self.cells is not None else None
+        board.heights = self.heights[:]
+        board.column_counts = self.column_counts[:]
+        board.fill = self.fill[:]
+        return board
+
+    @property
+    def grid(self):
+        """List-of-lists view for rendering and printing, derived from the bits when there are no colors."""
+        if self.cells is not None:
+            return self.cells
+        return [[1 if mask >> x & 1 else 0 for x in range(self.cols)] for mask in self.bits]
+
+    def is_filled(self, x, y):
+        """Check whether the cell at (x, y) is occupied. Coordinates must be inside the board."""
+        return self.bits[y] >> x & 1 == 1
+
+    def collides(self, piece_rows, y):
+        """
+        Check a piece against the board.
+        `piece_rows` is a sequence of (row offset, column bitmask) pairs placed at row `y`.
+        Rows above the board are free, rows below it collide.
+        """
+        bits = self.bits
+        rows = self.rows
+        for dy, mask in piece_rows:
+            row = y + dy
+            if row >= rows:
+                return True
+            if row >= 0 and bits[row] & mask:
+                return True
+        return False
+
+    def drop_distance(self, entry, y):
+        """
+        Rows a piece (a PieceMask) at row `y` can fall before it lands. While the piece is above the stack in
+        every column it covers, this is read from the column heights and the piece's lowest cell per column;
+        a piece below the top of a column (under an overhang) is scanned down row by row instead.
+        """
+        rows = self.rows
+        heights = self.heights
+        distance = rows - y  # More than any gap, however far above the board the piece is
+        for x, bottom in entry.bottoms:
+            gap = rows - heights[x] - 1 - y - bottom  # Empty rows between the piece and the top of column x
+            if gap < 0:
+                break
+            if gap < distance:
+                distance = gap
+        else:
+            return distance
+
+        distance = 0
+        while not self.collides(entry.rows, y + distance + 1):
+            distance += 1
+        return distance
+
+    def lock(self, piece_rows, y, piece_type=0):
+        """OR a piece into the board, painting the color layer if there is one."""
+        bits = self.bits
+        cells = self.cells
+        fill = self.fill
+        heights = self.heights
+        counts = self.column_counts
+        height_at_row = self.rows - y
+        for dy, mask in piece_rows:
+            row = y + dy
+            if row < 0:
+                continue  # Cells above the board are lost
+            bits[row] |= mask
+            x = 0
+            while mask >> x:
+                if mask >> x & 1:
+                    fill[row] += 1
+                    counts[x] += 1
+                    if heights[x] < height_at_row - dy:
+                        heights[x] = height_at_row - dy
+                    if cells is not None:
+                        cells[row][x] = piece_type
+                x += 1
+
+    def full_lines(self):
+        """Count the rows that are completely filled."""
+        return self.fill.count(self.cols)
+
+    def clear_lines(self):
+        """Remove filled rows, shift everything above them down and return how many were cleared."""
+        cols = self.cols
+        fill = self.fill
+        if cols not in fill:
+            return 0
+        kept = [y for y, count in enumerate(fill) if count != cols]
+        cleared = self.rows - len(kept)
+        bits = self.bits
+        self.bits = [0] * cleared + [bits[y] for y in kept]
+        self.fill = [0] * cleared + [fill[y] for y in kept]
+        if self.cells is not None:
+            cells = self.cells
+            self.cells = [[0 for _ in range(cols)] for _ in range(cleared)] + [cells[y] for y in kept]
+
+        # A full row has a cell in every column, so each column loses one cell per cleared row.
+        # Columns whose top cell was in a cleared row may drop further and are rescanned.
+        self.column_counts = [count - cleared for count in self.column_counts]
+        for x in range(cols):
+            top = self.rows - self.heights[x]
+            if fill[top] == cols:
+                self._rescan_column(x)
+            else:
+                self.heights[x] -= cleared
+        return cleared
+
+    def place(self, piece_rows, y, piece_type=0):
+        """
+        Lock a piece and clear lines in one step that can be taken back with undo().
+        Returns (lines cleared, undo record). Undo records must be undone in reverse order.
+        """
+        # Clearing swaps in new lists, so keeping references to the current ones is enough to restore them
+        record = (piece_rows, y, self.bits, self.cells, self.fill, self.heights[:], self.column_counts)
+        self.column_counts = self.column_counts[:]
+        self.lock(piece_rows, y, piece_type)
+        return self.clear_lines(), record
+
+    def undo(self, record):
+        """Restore the board to how it was before the place() call that returned `record`."""
+        piece_rows, y, self.bits, self.cells, self.fill, self.heights, self.column_counts = record
+        # The restored lists are as they were right after the lock, so only the piece itself is taken out
+        bits = self.bits
+        cells = self.cells
+        fill = self.fill
+        for dy, mask in piece_rows:
+            row = y + dy
+            if row < 0:
+                continue
+            bits[row] &= ~mask
+            fill[row] -= bin(mask).count('1')
+            if cells is not None:
+                x = 0
+                while mask >> x:
+                    if mask >> x & 1:
+                        cells[row][x] = 0
+                    x += 1
+
+    def is_empty(self):
+        """Perfect clear check: no cells left on the board."""
+        return not any(self.fill)
+
+    def column_heights(self):
+        """Height of each column measured from the floor (0 for an empty column)."""
+        return self.heights[:]
@@ -1,22 +1,104 @@
+import math
+import time
 import pygame
 
-def handle_input(key_input, event_list, tetris_game):
-    """Handle player inputs."""
-    if key_input[pygame.K_LEFT]:
-        tetris_game.move_left()
-    elif key_input[pygame.K_RIGHT]:
-        tetris_game.move_right()
-
-    if key_input[pygame.K_DOWN]:
-        tetris_game.move_down()
-
-    for event in event_list:
-        if event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_c:
-                tetris_game.hold()
-            if event.key == pygame.K_z:
-                tetris_game.rotate_ccw()
-            if event.key == pygame.K_x:
-                tetris_game.rotate_cw()
-            if event.key == pygame.K_SPACE:
-                tetris_game.hard_drop()
+DEFAULT_DAS = 0.167  # Seconds a direction is held before it auto-repeats (10 frames at 60 FPS)
+DEFAULT_ARR = 0.033  # Seconds between auto-repeat shifts; 0 shifts straight to the wall
+DEFAULT_SOFT_DROP_FACTOR = 20  # Soft drop speed as a multiple of the base drop rate; math.inf drops to the floor
+BASE_DROP_RATE = 1.0  # Rows per second the soft drop factor multiplies (level 1 gravity)
+
+
+class Controls:
+    """
+    Keyboard handling with delayed auto-shift (DAS), auto-repeat rate (ARR) and a soft drop factor, timed
+    in seconds rather than frames so the piece moves at the same speed at any frame rate.
+    A direction moves once when pressed, then repeats every `arr` seconds after being held for `das`.
+    The most recently pressed direction wins while both are held. However many cells or rows are due in
+    a frame, the piece moves by them in one step, limited by a single shift- or drop-distance query.
+    """
+
+    def __init__(self, das=DEFAULT_DAS, arr=DEFAULT_ARR, soft_drop_factor=DEFAULT_SOFT_DROP_FACTOR,
+                 base_drop_rate=BASE_DROP_RATE):
+        self.das = das
+        self.arr = arr
+        self.soft_drop_factor = soft_drop_factor
+        self.base_drop_rate = base_drop_rate
+        self.direction = 0  # -1 left, 1 right, 0 none
+        self.next_shift = None  # Time of the next auto-repeat shift
+        self.next_drop = None  # Time of the next soft drop row
+
+    def update(self, key_input, event_list, game, now=None):
+        """Apply one frame of input to `game`. `now` is a time.monotonic() value (the current time by default)."""
+        if now is None:
+            now = time.monotonic()
+
+        for event in event_list:
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_LEFT:
+                    self.press_direction(game, -1, now)
+                elif event.key == pygame.K_RIGHT:
+                    self.press_direction(game, 1, now)
+                elif event.key == pygame.K_DOWN:
+                    self.press_soft_drop(game, now)
+                elif event.key == pygame.K_c:
+                    game.hold()
+                elif event.key == pygame.K_z:
+                    game.rotate_ccw()
+                elif event.key == pygame.K_x:
+                    game.rotate_cw()
+                elif event.key == pygame.K_SPACE:
+                    game.hard_drop()
+
+        left = key_input[pygame.K_LEFT]
+        right = key_input[pygame.K_RIGHT]
+        if self.direction and not (left if self.direction < 0 else right):
+            # Released: fall back to the other direction if it is still held, charging DAS afresh
+            self.direction = 0
+            if left or right:
+                self.direction = -1 if left else 1
+                self.next_shift = now + self.das
+        if self.direction:
+            self.auto_shift(game, now)
+
+        if key_input[pygame.K_DOWN]:
+            if self.next_drop is None:
+                self.next_drop = now
+            self.auto_drop(game, now)
+        else:
+            self.next_drop = None
+
+    def press_direction(self, game, direction, now):
+        """Shift one cell now and start charging DAS in this direction."""
+        game.shift(direction)
+        self.direction = direction
+        self.next_shift = now + self.das
+
+    def press_soft_drop(self, game, now):
+        game.drop(1)
+        self.next_drop = now + self.soft_drop_interval()
+
+    def auto_shift(self, game, now):
+        if now < self.next_shift:
+            return
+        if self.arr <= 0:
+            game.shift(self.direction * game.cols)  # Instant to the wall
+            return
+        due = int((now - self.next_shift) / self.arr) + 1
+        game.shift(self.direction * due)
+        self.next_shift += due * self.arr
+
+    def auto_drop(self, game, now):
+        if now < self.next_drop:
+            return
+        interval = self.soft_drop_interval()
+        if interval <= 0:
+            game.drop(game.rows)  # Straight to the floor
+            return
+        due = int((now - self.next_drop) / interval) + 1
+        game.drop(due)
+        self.next_drop += due * interval
+
+    def soft_drop_interval(self):
+        """Seconds per soft drop row, 0 for an instant drop."""
+        rate = self.soft_drop_factor * self.base_drop_rate
+        return 0.0 if math.isinf(rate) else 1 / rate
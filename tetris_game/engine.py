@@ -0,0 +1,404 @@
+import time
+from collections import namedtuple
+from tetris_game.board import Board
+from tetris_game.events import EventStream, PieceLocked, LinesCleared, ToppedOut
+from tetris_game.piece_masks import get_piece_masks
+from tetris_game.piece_queue import PieceQueue
+from tetris_game.tetromino import Tetromino
+from tetris_game.score import calculate_score  # Import score calculation logic
+
+PREVIEW_COUNT = 5  # Upcoming pieces visible to the player (and to bots)
+
+# Input names used by move generators and replays, and the engine methods that perform them
+INPUT_ACTIONS = {
+    'MOVE_LEFT': 'move_left',
+    'MOVE_RIGHT': 'move_right',
+    'ROTATE_CW': 'rotate_cw',
+    'ROTATE_CCW': 'rotate_ccw',
+    'MOVE_DOWN': 'move_down',
+    'DAS_LEFT': 'das_left',
+    'DAS_RIGHT': 'das_right',
+    'SOFT_DROP': 'soft_drop',
+    'HARD_DROP': 'hard_drop',
+    'HOLD': 'hold',
+}
+
+# Copy of what is on screen, safe to draw from another thread while the game goes on
+GameSnapshot = namedtuple('GameSnapshot', ['grid', 'piece', 'x', 'y', 'ghost_y', 'shape', 'hold', 'preview', 'score',
+                                           'lines', 'start_time', 'game_over'])
+
+class TetrisEngine:
+    """
+    Headless Tetris rules: board, pieces, hold, queue, line clears and scoring.
+    Nothing here imports pygame, so bots and simulators can run it in any process.
+    Locks, clears and top-outs are reported to the subscribers of `events`; nothing is printed.
+    """
+
+    def __init__(self, rows=21, cols=10, seed=None):
+        self.rows = rows
+        self.cols = cols
+
+        self.board = Board(rows, cols)
+        self.events = EventStream()
+        self.game_over = False
+        self.current_piece = None
+        self.hold_piece = None
+        self.hold_used = False
+        self.next_queue = PieceQueue(seed)  # Same seed, same pieces
+        self.next_piece()
+        self.lines_cleared = 0
+        self.start_time = time.time()
+        self.score = 0
+        self.combo = -1  # Initialize combo to -1 (no combo yet)
+        self.last_was_b2b = False  # Track if the last clear was eligible for B2B
+        self.last_move_was_rotation = False  # Track if the last move was a rotation
+
+    @property
+    def grid(self):
+        """List-of-lists view of the board's color layer, used for rendering."""
+        return self.board.grid
+
+    @grid.setter
+    def grid(self, grid):
+        self.board = Board.from_grid(grid)
+
+    @property
+    def seed(self):
+        """Seed of the piece sequence, to replay this game."""
+        return self.next_queue.seed
+
+    @property
+    def queue_index(self):
+        """Number of pieces taken from the queue so far (absolute index of the next queued piece)."""
+        return self.next_queue.index
+
+    def snapshot(self):
+        """Copy the visible state (board, active piece and its ghost, hold, preview, counters) into a GameSnapshot."""
+        piece = self.current_piece
+        return GameSnapshot([row[:] for row in self.grid], piece.type, piece.x, piece.y,
+                            piece.y + self.drop_distance(), piece.shape,
+                            self.hold_piece.type if self.hold_piece else None,
+                            tuple(self.next_queue.peek(PREVIEW_COUNT)), self.score, self.lines_cleared,
+                            self.start_time, self.game_over)
+
+    def next_piece(self):
+        """Move to the next piece."""
+        piece_type = self.next_queue.pop()
+        self.current_piece = Tetromino(piece_type)
+        self.current_piece.x = 3  # Reset position
+        self.hold_used = False  # Allow hold usage again
+        if not self.game_over and self.current_piece.check_collision(self.board):
+            self.top_out()  # No room to spawn
+
+    def top_out(self):
+        """End the game."""
+        self.game_over = True
+        if self.events.subscribers:
+            self.events.emit(ToppedOut(self.current_piece.type, self.lines_cleared, self.score))
+
+    def hold(self):
+        """Hold the current piece, swap with the held piece if necessary."""
+        if self.hold_used:
+            return  # You can only hold once per piece drop
+
+        if self.hold_piece:
+            # Swap the current piece with the held piece
+            self.current_piece, self.hold_piece = self.hold_piece, self.current_piece
+            # Reset the current piece's position and rotation
+            self.current_piece.x = 3
+            self.current_piece.y = 0
+            self.current_piece.rotation = 0
+            self.current_piece.shape = self.current_piece.shape_data[0]  # Reset shape to initial orientation
+        else:
+            # Hold the current piece and fetch a new one
+            self.hold_piece = self.current_piece
+            self.next_piece()
+
+        self.hold_piece.rotation = 0
+        self.hold_piece.shape = self.hold_piece.shape_data[0]  # Reset the held piece's shape
+        self.hold_used = True  # Mark that hold was used
+
+
+    def reset_board_and_bag(self, seed=None):
+        self.board = Board(self.rows, self.cols)
+        self.game_over = False
+        self.next_queue = PieceQueue(seed)
+        self.next_piece()
+        self.hold_piece = None
+        self.hold_used = False
+        self.lines_cleared = 0
+        self.score = 0
+        self.combo = -1  # Reset combo
+        self.start_time = time.time()
+
+    def update_last_move(self, original_x, original_y, original_rotation, was_rotation):
+        """Update the last move state to indicate if it actually moved or rotated the piece."""
+        moved = (self.current_piece.x != original_x or 
+                 self.current_piece.y != original_y or 
+                 self.current_piece.rotation != original_rotation)
+        self.last_move_was_rotation = was_rotation and moved
+        return moved
+
+    def move_left(self):
+        original_x = self.current_piece.x
+        original_y = self.current_piece.y
+        original_rotation = self.current_piece.rotation
+        if self.current_piece.move(-1, 0, self.board):
+            self.update_last_move(original_x, original_y, original_rotation, was_rotation=False)
+
+    def move_right(self):
+        original_x = self.current_piece.x
+        original_y = self.current_piece.y
+        original_rotation = self.current_piece.rotation
+        if self.current_piece.move(1, 0, self.board):
+            self.update_last_move(original_x, original_y, original_rotation, was_rotation=False)
+
+    def move_down(self):
+        original_x = self.current_piece.x
+        original_y = self.current_piece.y
+        original_rotation = self.current_piece.rotation
+        if self.current_piece.move(0, 1, self.board):
+            self.update_last_move(original_x, original_y, original_rotation, was_rotation=False)
+
+    def shift_distance(self, direction, limit=None):
+        """
+        Cells the current piece can move in `direction` (-1 left, 1 right) before it is blocked, at most `limit`.
+        Each piece row is a run of cells, so its room is the gap between its end cell and the nearest filled
+        cell or wall in the same board row; the piece can move the smallest gap of its rows.
+        """
+        piece = self.current_piece
+        entry = get_piece_masks(self.cols)[piece.type][piece.rotation][piece.x]
+        bits = self.board.bits
+        wall = 1 << self.cols
+        distance = self.cols if limit is None else limit
+        for dy, mask in entry.rows:
+            row = piece.y + dy
+            if row >= self.rows:
+                return 0
+            filled = bits[row] if row >= 0 else 0
+            if direction > 0:
+                above = (filled | wall) >> mask.bit_length()  # Filled cells and the wall right of the run
+                gap = (above & -above).bit_length() - 1
+            else:
+                low = (mask & -mask).bit_length() - 1
+                gap = low - (filled & ((1 << low) - 1)).bit_length()  # Nearest filled cell (or wall) to the left
+            if gap < distance:
+                distance = gap
+                if not distance:
+                    break
+        return distance
+
+    def drop_distance(self):
+        """Rows the current piece can fall before it lands."""
+        piece = self.current_piece
+        return self.board.drop_distance(get_piece_masks(self.cols)[piece.type][piece.rotation][piece.x], piece.y)
+
+    def shift(self, dx):
+        """Move the current piece up to |dx| cells sideways in one step, stopping where it is blocked."""
+        direction = 1 if dx > 0 else -1
+        distance = self.shift_distance(direction, abs(dx))
+        if distance:
+            original_x = self.current_piece.x
+            self.current_piece.x += direction * distance
+            self.update_last_move(original_x, self.current_piece.y, self.current_piece.rotation, was_rotation=False)
+        return distance
+
+    def drop(self, rows):
+        """Move the current piece up to `rows` rows down in one step, without locking it."""
+        distance = min(rows, self.drop_distance())
+        if distance:
+            original_y = self.current_piece.y
+            self.current_piece.y += distance
+            self.update_last_move(self.current_piece.x, original_y, self.current_piece.rotation, was_rotation=False)
+        return distance
+
+    def das_left(self):
+        """Shift left until blocked, like holding the key with instant auto-repeat."""
+        self.shift(-self.cols)
+
+    def das_right(self):
+        """Shift right until blocked, like holding the key with instant auto-repeat."""
+        self.shift(self.cols)
+
+    def soft_drop(self):
+        """Move down until the piece lands, without locking it."""
+        self.drop(self.rows)
+
+    def rotate_cw(self):
+        original_x = self.current_piece.x
+        original_y = self.current_piece.y
+        original_rotation = self.current_piece.rotation
+        self.current_piece.rotate(self.board, counterclockwise=False)
+        self.update_last_move(original_x, original_y, original_rotation, was_rotation=True)
+
+    def rotate_ccw(self):
+        original_x = self.current_piece.x
+        original_y = self.current_piece.y
+        original_rotation = self.current_piece.rotation
+        self.current_piece.rotate(self.board, counterclockwise=True)
+        self.update_last_move(original_x, original_y, original_rotation, was_rotation=True)
+
+    def hard_drop(self):
+        """Immediately drop the piece to the lowest valid position."""
+        original_x = self.current_piece.x
+        original_y = self.current_piece.y
+        original_rotation = self.current_piece.rotation
+
+        self.current_piece.y += self.drop_distance()
+
+        # Only update last move if the drop changed x or y position
+        if original_x != self.current_piece.x or original_y != self.current_piece.y:
+            self.update_last_move(original_x, original_y, original_rotation, was_rotation=False)
+        
+        # Lock the piece and move to the next one
+        self.lock_piece()
+        self.next_piece()
+
+    def press(self, command):
+        """Perform one input by name, e.g. 'DAS_LEFT' or 'HARD_DROP' (see INPUT_ACTIONS)."""
+        getattr(self, INPUT_ACTIONS[command])()
+
+    def is_immobile_spin(self):
+        """Check if the current piece is in a true immobile spin position."""
+        if not self.last_move_was_rotation:
+            return False
+
+        cannot_move_left = self.current_piece.check_collision(self.board, -1, 0)
+        cannot_move_right = self.current_piece.check_collision(self.board, 1, 0)
+        cannot_move_down = self.current_piece.check_collision(self.board, 0, 1)
+        
+        if self.current_piece.type == 'T':
+            corners_blocked = self.count_t_spin_corners()
+            return (cannot_move_left and cannot_move_right and cannot_move_down) or (corners_blocked >= 3)
+
+        return cannot_move_left and cannot_move_right and cannot_move_down
+
+    def count_t_spin_corners(self):
+        """Count the number of corners blocked around the T-piece."""
+        corner_offsets = [(-1, -1), (1, -1), (-1, 1), (1, 1)]
+        corner_count = 0
+        for dx, dy in corner_offsets:
+            corner_x = self.current_piece.x + dx
+            corner_y = self.current_piece.y + dy
+            if 0 <= corner_x < self.cols and 0 <= corner_y < self.rows:
+                if self.board.is_filled(corner_x, corner_y):
+                    corner_count += 1
+        return corner_count
+
+    def lock_piece(self):
+        """Lock the current piece in place and check for line clears. Returns the board's undo record."""
+        is_spin = self.is_immobile_spin()  # Detect spin status
+        piece = self.current_piece
+        entry = get_piece_masks(self.cols)[piece.type][piece.rotation][piece.x]
+        cleared_lines, board_record = self.board.place(entry.rows, piece.y, piece.type)
+        if self.events.subscribers:
+            self.events.emit(PieceLocked(piece.type, piece.x, piece.y, piece.rotation,
+                                         tuple(tuple(row) for row in self.board.grid)))
+        self.score_lines(cleared_lines, is_spin)
+        if piece.y + entry.bottom < 0:
+            self.top_out()  # Lock out: the whole piece locked above the board
+        return board_record
+
+    def apply_placement(self, x, y, rotation, use_hold=False):
+        """
+        Place the current piece (holding first if asked) at x, y and rotation, clear lines, score the clear
+        and spawn the next piece. The placement is teleported, so it never counts as a spin.
+        Returns an undo record that undo() takes to restore the game exactly.
+        """
+        current = self.current_piece
+        held = self.hold_piece
+        record = (
+            current, current.x, current.y, current.rotation,
+            held, held.x if held else 0, held.y if held else 0, held.rotation if held else 0,
+            self.hold_used, self.combo, self.last_was_b2b, self.score, self.lines_cleared,
+            self.last_move_was_rotation, self.queue_index, self.next_queue.peek(2), self.game_over,
+        )
+        if use_hold:
+            self.hold()
+
+        piece = self.current_piece
+        piece.x = x
+        piece.y = y
+        piece.rotation = rotation
+        piece.shape = piece.shape_data[rotation]
+        self.last_move_was_rotation = False
+        board_record = self.lock_piece()
+        self.next_piece()
+        return record, board_record
+
+    def undo(self, record):
+        """Take back the apply_placement() call that returned `record`. Undo in reverse order."""
+        (current, current_x, current_y, current_rotation,
+         held, held_x, held_y, held_rotation,
+         self.hold_used, self.combo, self.last_was_b2b, self.score, self.lines_cleared,
+         self.last_move_was_rotation, queue_index, upcoming, self.game_over), board_record = record
+
+        self.board.undo(board_record)
+        # Put the pieces taken from the queue back in front. Bags generated meanwhile stay at the end,
+        # so the upcoming sequence is the same as before.
+        self.next_queue.unpop(upcoming[:self.queue_index - queue_index])
+
+        for piece, piece_x, piece_y, piece_rotation in ((current, current_x, current_y, current_rotation),
+                                                       (held, held_x, held_y, held_rotation)):
+            if piece is not None:
+                piece.x = piece_x
+                piece.y = piece_y
+                piece.rotation = piece_rotation
+                piece.shape = piece.shape_data[piece_rotation]
+        self.current_piece = current
+        self.hold_piece = held
+
+    def detect_clear_type(self, cleared_lines):
+        """Determine the type of line clear (single, double, triple, or quad)."""
+        if cleared_lines == 1:
+            return "single"
+        elif cleared_lines == 2:
+            return "double"
+        elif cleared_lines == 3:
+            return "triple"
+        elif cleared_lines == 4:
+            return "quad"
+        else:
+            return None
+
+    def detect_perfect_clear(self):
+        """Check if the board is completely empty (Perfect Clear detection)."""
+        return self.board.is_empty()
+
+    def check_b2b(self, clear_type, is_spin):
+        """Helper function to check if the current clear is a B2B."""
+        return self.last_was_b2b and (clear_type == "quad" or is_spin)
+
+    def clear_lines(self, is_spin):
+        """Clear filled lines and shift the board down."""
+        self.score_lines(self.board.clear_lines(), is_spin)
+
+    def score_lines(self, cleared_lines, is_spin):
+        """Update the line count, B2B, combo and score after `cleared_lines` lines were cleared."""
+        self.lines_cleared += cleared_lines
+
+        clear_type = self.detect_clear_type(cleared_lines)
+
+        if cleared_lines > 0:
+            is_b2b = self.check_b2b(clear_type, is_spin)
+            if clear_type == "quad" or is_spin:
+                self.last_was_b2b = True
+            else:
+                self.last_was_b2b = False
+            self.combo += 1
+            is_perfect_clear = self.detect_perfect_clear()
+            self.score += calculate_score(
+                cleared_lines, 
+                is_spin=is_spin, 
+                is_b2b=is_b2b, 
+                combo=self.combo, 
+                is_perfect_clear=is_perfect_clear
+            )
+
+            if self.events.subscribers:
+                piece = self.current_piece
+                self.events.emit(LinesCleared(cleared_lines, clear_type, is_spin, is_b2b, self.combo,
+                                              is_perfect_clear, self.score, piece.type, piece.x, piece.y,
+                                              piece.rotation))
+        else:
+            self.combo = -1
@@ -0,0 +1,53 @@
+from collections import namedtuple
+
+# Game events. Emitters check EventStream.subscribers first, so without subscribers no event is even built.
+PlacementFound = namedtuple('PlacementFound', ['piece', 'x', 'y', 'rotation'])
+# PieceLocked.grid is a copy of the board right after the lock (rows of cells), which later moves leave alone
+PieceLocked = namedtuple('PieceLocked', ['piece', 'x', 'y', 'rotation', 'grid'])
+LinesCleared = namedtuple('LinesCleared', ['lines', 'clear_type', 'spin', 'b2b', 'combo', 'perfect_clear',
+                                           'score', 'piece', 'x', 'y', 'rotation'])
+ToppedOut = namedtuple('ToppedOut', ['piece', 'lines', 'score'])
+MaxMovesReached = namedtuple('MaxMovesReached', ['moves'])  # A bot placed all the pieces it was allowed
+
+
+class EventStream:
+    """
+    Delivers game events to subscribers: callables that take one event, optionally only for some event types.
+    Emit with `if stream.subscribers: stream.emit(Event(...))` to skip all the work when nobody listens.
+    """
+
+    def __init__(self):
+        self.subscribers = []  # (callback, event types or None for every type)
+
+    def subscribe(self, callback, *event_types):
+        """Call `callback(event)` for every event, or only for the given event types."""
+        self.subscribers.append((callback, event_types or None))
+
+    def unsubscribe(self, callback):
+        self.subscribers = [entry for entry in self.subscribers if entry[0] is not callback]
+
+    def emit(self, event):
+        for callback, event_types in self.subscribers:
+            if event_types is None or type(event) in event_types:
+                callback(event)
+
+
+def print_event(event):
+    """Subscriber that prints events to the console, like the debug output the game used to print."""
+    if type(event) is LinesCleared:
+        print(
+            f"Clear: {event.clear_type}, Spin: {event.spin}, B2B: {event.b2b}, Combo: {event.combo}, "
+            f"PC: {event.perfect_clear}, Score: {event.score}, "
+            f"Piece: {event.piece}, X: {event.x}, Y: {event.y}, Rotation: {event.rotation}"
+        )
+    elif type(event) is PieceLocked:
+        print(f"Locked {event.piece} at ({event.x}, {event.y}) with rotation {event.rotation}. Board (last four rows):")
+        for row in event.grid[-4:]:
+            print(' '.join(str(cell) if cell != 0 else '.' for cell in row))
+        print()
+    elif type(event) is PlacementFound:
+        print(f"Placement found: {event.piece} at ({event.x}, {event.y}) with rotation {event.rotation}")
+    elif type(event) is ToppedOut:
+        print(f"Topped out with {event.piece}. Lines: {event.lines}, Score: {event.score}")
+    elif type(event) is MaxMovesReached:
+        print(f"Maximum moves reached ({event.moves}). Bot will stop placing pieces.")
@@ -0,0 +1,103 @@
+import time
+
+FRAME_RATE = 60  # Frames per second; gravity is measured in G, rows per frame
+MAX_GRAVITY = 20  # 20G: a piece reaches the stack on the frame it appears
+DEFAULT_LOCK_DELAY = 0.5  # Seconds a grounded piece waits before it locks
+DEFAULT_MOVE_RESET_LIMIT = 15  # Moves and rotations on the ground that restart the lock delay, per row reached
+
+
+def gravity_for_level(level):
+    """Gravity in G for a level, from the guideline curve: (0.8 - (level - 1) * 0.007) ** (level - 1) seconds per row."""
+    seconds_per_row = (0.8 - (level - 1) * 0.007) ** (level - 1)
+    return min(MAX_GRAVITY, 1 / (seconds_per_row * FRAME_RATE))
+
+
+class Gravity:
+    """
+    Real-time rules on top of a TetrisEngine: pieces fall at a gravity in G, and a grounded piece locks after
+    the lock delay. Moving or rotating the piece on the ground restarts the delay, at most `move_reset_limit`
+    times per lowest row reached; once the resets run out the piece locks as soon as it touches the ground.
+    Time is read from `clock`, time.monotonic or any other function returning seconds, and the game is
+    stepped in whole frames, so an injected clock gives the same game on every run.
+    """
+
+    def __init__(self, game, level=1, gravity=None, lock_delay=DEFAULT_LOCK_DELAY,
+                 move_reset_limit=DEFAULT_MOVE_RESET_LIMIT, clock=time.monotonic):
+        self.game = game
+        self.gravity = gravity if gravity is not None else gravity_for_level(level)
+        self.lock_delay_frames = max(1, round(lock_delay * FRAME_RATE))
+        self.move_reset_limit = move_reset_limit
+        self.clock = clock
+        self.start = clock()
+        self.frame = 0  # Frames run so far
+        self.piece = None  # Piece the state below belongs to
+        self.position = None  # (x, y, rotation) at the end of the last frame
+        self.lowest = 0  # Lowest row the piece has reached
+        self.fall = 0.0  # Fraction of a row of gravity carried to the next frame
+        self.grounded_frames = 0  # Lock delay frames used
+        self.resets = 0  # Lock delay restarts used on the lowest row
+        self.landed = False  # The piece has touched the ground, so moves restart the lock delay
+
+    def rows_per_second(self):
+        return self.gravity * FRAME_RATE
+
+    def update(self):
+        """Run every frame that is due by the clock. Returns the number of frames run."""
+        due = int((self.clock() - self.start) * FRAME_RATE) - self.frame
+        if due > 0:
+            self.advance(due)
+        return max(due, 0)
+
+    def advance(self, frames):
+        """Run `frames` frames, whatever the clock says."""
+        game = self.game
+        for _ in range(frames):
+            if game.game_over:
+                break
+            self.step()
+        self.frame += frames
+
+    def step(self):
+        """Run one frame: apply gravity, then the lock delay."""
+        game = self.game
+        piece = game.current_piece
+        if piece is not self.piece:
+            self.spawned(piece)
+        elif self.landed and (piece.x, piece.y, piece.rotation) != self.position:
+            # Moved or rotated since the last frame
+            if self.resets < self.move_reset_limit:
+                self.grounded_frames = 0
+            self.resets += 1
+
+        distance = game.drop_distance()
+        if distance:
+            self.fall += self.gravity
+            rows = int(self.fall)
+            if rows:
+                self.fall -= rows
+                distance -= game.drop(rows)
+        if piece.y > self.lowest:
+            # A new lowest row gives the full lock delay and resets back
+            self.lowest = piece.y
+            self.grounded_frames = 0
+            self.resets = 0
+
+        if distance == 0:
+            self.fall = 0.0
+            self.landed = True
+            self.grounded_frames += 1
+            if self.grounded_frames >= self.lock_delay_frames or self.resets >= self.move_reset_limit:
+                game.lock_piece()
+                game.next_piece()
+                return
+        self.position = (piece.x, piece.y, piece.rotation)
+
+    def spawned(self, piece):
+        """Start the timers over for a new piece."""
+        self.piece = piece
+        self.position = (piece.x, piece.y, piece.rotation)
+        self.lowest = piece.y
+        self.fall = 0.0
+        self.grounded_frames = 0
+        self.resets = 0
+        self.landed = False
@@ -0,0 +1,60 @@
+from collections import namedtuple
+from tetris_game.tetromino_data import SHAPES
+
+# A piece in one rotation at one x position, ready for bitwise collision checks.
+# rows:    (row offset, column bitmask) pairs for every non-empty shape row
+# left, right, top, bottom: bounding box of the occupied cells (columns absolute, rows relative to the piece y)
+# bottoms: (column, row offset) of the lowest occupied cell in each column the piece covers
+# cells:   occupied cells as one integer, `cols` bits per row counted from the top occupied row
+#          (40 bits on a standard board); together with the absolute top row it identifies a placement
+PieceMask = namedtuple('PieceMask', ['rows', 'left', 'right', 'top', 'bottom', 'bottoms', 'cells'])
+
+_TABLES = {}  # Built tables keyed by board width
+
+
+def build_piece_masks(cols):
+    """
+    Precompute masks for every piece, rotation and x position that fits inside a board `cols` wide.
+    Returns {piece type: [ {x: PieceMask} for each rotation ]}; x positions missing from a rotation's dict
+    would put a block outside the board.
+    """
+    table = {}
+    for piece_type, rotations in SHAPES.items():
+        table[piece_type] = []
+        for shape in rotations:
+            cells = [(i, j) for i, row in enumerate(shape) for j, value in enumerate(row) if value != 0]
+            min_j = min(j for _, j in cells)
+            max_j = max(j for _, j in cells)
+            top = min(i for i, _ in cells)
+            bottom = max(i for i, _ in cells)
+
+            by_x = {}
+            for x in range(-min_j, cols - max_j):
+                rows = []
+                for i in range(top, bottom + 1):
+                    mask = 0
+                    for cell_i, j in cells:
+                        if cell_i == i:
+                            mask |= 1 << (x + j)
+                    if mask:
+                        rows.append((i, mask))
+                bottoms = tuple((x + j, max(i for i, cell_j in cells if cell_j == j))
+                                for j in sorted({j for _, j in cells}))
+                cells_mask = 0
+                for i, mask in rows:
+                    cells_mask |= mask << (cols * (i - top))
+                by_x[x] = PieceMask(tuple(rows), x + min_j, x + max_j, top, bottom, bottoms, cells_mask)
+            table[piece_type].append(by_x)
+    return table
+
+
+def get_piece_masks(cols=10):
+    """Return the mask table for a board width, building it on first use."""
+    table = _TABLES.get(cols)
+    if table is None:
+        table = _TABLES[cols] = build_piece_masks(cols)
+    return table
+
+
+# Standard board width is built once at import
+PIECE_MASKS = get_piece_masks(10)
@@ -0,0 +1,56 @@
+import random
+from collections import deque
+from itertools import islice
+from tetris_game.tetromino_data import COLORS
+
+BAG = tuple(COLORS.keys())  # One of each piece
+
+
+class PieceQueue:
+    """
+    Upcoming pieces from a seeded 7-bag randomizer, produced lazily one bag at a time.
+    Bag k is shuffled by its own Random derived from (seed, k), so a game is reproducible from its seed,
+    parallel games share no RNG state and any position can be reached without replaying earlier bags.
+    """
+
+    def __init__(self, seed=None):
+        self.seed = seed if seed is not None else random.randrange(1 << 62)
+        self.index = 0  # Absolute index of the next piece pop() returns
+        self.next_bag = 0  # Index of the next bag to generate
+        self._pieces = deque()
+
+    def bag(self, bag_index):
+        """Return the shuffled contents of bag `bag_index`."""
+        pieces = list(BAG)
+        random.Random((self.seed << 32) + bag_index).shuffle(pieces)
+        return pieces
+
+    def _fill(self, count):
+        """Generate bags until at least `count` pieces are buffered."""
+        while len(self._pieces) < count:
+            self._pieces.extend(self.bag(self.next_bag))
+            self.next_bag += 1
+
+    def pop(self):
+        """Take the next piece."""
+        if not self._pieces:
+            self._fill(1)
+        self.index += 1
+        return self._pieces.popleft()
+
+    def unpop(self, pieces):
+        """Put pieces taken by pop() back in front, in the order they were taken."""
+        self._pieces.extendleft(reversed(pieces))
+        self.index -= len(pieces)
+
+    def peek(self, count):
+        """Return the next `count` pieces without taking them."""
+        self._fill(count)
+        return list(islice(self._pieces, count))
+
+    def seek(self, index):
+        """Jump to absolute piece index `index`, regenerating only the bag it falls in."""
+        bag_index, offset = divmod(index, len(BAG))
+        self._pieces = deque(self.bag(bag_index)[offset:])
+        self.next_bag = bag_index + 1
+        self.index = index
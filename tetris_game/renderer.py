@@ -0,0 +1,186 @@
+import time
+import pygame
+from tetris_game.engine import PREVIEW_COUNT
+from tetris_game.tetromino_data import COLORS, SHAPES
+
+BACKGROUND = (0, 0, 0)
+GRID_LINE = (50, 50, 50)
+BOX_LINE = (255, 255, 255)
+TEXT = (255, 255, 255)
+PREVIEW_TOP = 200  # y of the first preview box
+PREVIEW_STEP = 10  # Gap between preview boxes
+TEXT_TOP = 100  # y of the score line; lines and time follow every 40 pixels
+GHOST = 'ghost-'  # Board cell value prefix for the ghost piece, e.g. 'ghost-T'
+GHOST_SHADE = 3  # Ghost cells are the piece color divided by this
+
+
+class Renderer:
+    """
+    Draws a Tetris game with dirty rectangles. The grid background, block sprites and the half-size hold and
+    preview pieces are rendered once; each frame only the board cells that changed since the last frame are
+    blitted, and the hold box and side panel are only redrawn when what they show changes. The ghost piece
+    marks where the active piece would land.
+    Frames are drawn from a GameSnapshot, by default one taken of the game at draw time.
+    draw() returns the changed screen rectangles for pygame.display.update().
+    """
+
+    def __init__(self, game):
+        self.game = game
+        self.screen = None  # Screen of the last frame; a new screen is drawn in full
+        self.font = None
+        self.background = None
+        self.blocks = {}  # Piece type (or GHOST + piece type) -> block sprite
+        self.small_pieces = {}  # Piece type -> half-size sprite of its spawn orientation
+        self.texts = {}  # Label -> (text, rendered surface)
+        self.cells = []  # Board cells as last drawn, active piece included
+        self.hold = None  # Held piece type as last drawn
+        self.side = None  # Preview and text as last drawn
+
+    def _layout(self):
+        game = self.game
+        block = game.block_size
+        self.board_rect = pygame.Rect(game.board_x_offset, 0, game.board_width, game.board_height)
+        # Half-size pieces start half a block into their box and can be two blocks wide, so they overhang it
+        self.hold_rect = pygame.Rect(game.board_x_offset - 80, 50, block * 5 // 2, block * 5 // 2)
+        side_x = game.board_x_offset + game.board_width + 20
+        side_bottom = PREVIEW_TOP + (PREVIEW_COUNT - 1) * (block * 2 + PREVIEW_STEP) + block * 5 // 2
+        self.side_rect = pygame.Rect(side_x, TEXT_TOP, self.screen.get_width() - side_x, side_bottom - TEXT_TOP)
+
+    def _prerender(self):
+        game = self.game
+        block = game.block_size
+        self.font = pygame.font.Font(None, 30)
+
+        self.background = pygame.Surface(self.board_rect.size)
+        self.background.fill(BACKGROUND)
+        for x in range(game.cols):
+            for y in range(game.rows):
+                pygame.draw.rect(self.background, GRID_LINE, pygame.Rect(x * block, y * block, block, block), 1)
+
+        half = block // 2
+        for piece_type, color in COLORS.items():
+            sprite = pygame.Surface((block, block))
+            sprite.fill(color)
+            self.blocks[piece_type] = sprite
+
+            # Ghost cells keep the grid line and are filled with a dark shade of the piece color
+            ghost = pygame.Surface((block, block))
+            ghost.blit(self.background, (0, 0), pygame.Rect(0, 0, block, block))
+            ghost.fill(tuple(channel // GHOST_SHADE for channel in color), pygame.Rect(1, 1, block - 2, block - 2))
+            self.blocks[GHOST + piece_type] = ghost
+
+            shape = SHAPES[piece_type][0]
+            small = pygame.Surface((len(shape[0]) * half, len(shape) * half), pygame.SRCALPHA)
+            for i, row in enumerate(shape):
+                for j, value in enumerate(row):
+                    if value != 0:
+                        small.fill(color, pygame.Rect(j * half, i * half, half, half))
+            self.small_pieces[piece_type] = small
+
+    def draw(self, screen, state=None):
+        """Draw what changed since the last frame and return the dirty rectangles. `state` is a GameSnapshot."""
+        if state is None:
+            state = self.game.snapshot()
+        if screen is not self.screen:
+            self.screen = screen
+            self._layout()
+            if self.font is None:
+                self._prerender()
+            screen.fill(BACKGROUND)
+            self.cells = [[None] * self.game.cols for _ in range(self.game.rows)]
+            self.hold = self.side = ()  # Never equal to a real state, so both get drawn
+            self.draw_board(screen, state)
+            self.draw_hold(screen, state)
+            self.draw_side(screen, state)
+            return [screen.get_rect()]
+
+        dirty = self.draw_board(screen, state)
+        rect = self.draw_hold(screen, state)
+        if rect is not None:
+            dirty.append(rect)
+        rect = self.draw_side(screen, state)
+        if rect is not None:
+            dirty.append(rect)
+        return dirty
+
+    def draw_board(self, screen, state):
+        """Blit the board cells that changed, with one dirty rectangle per changed row."""
+        game = self.game
+        block = game.block_size
+        left = self.board_rect.x
+        frame = state.grid
+
+        # Rows holding the ghost or the active piece are copied and the pieces written into them
+        piece_rows = {}
+        for piece_y, value in ((state.ghost_y, GHOST + state.piece), (state.y, state.piece)):
+            for i, row in enumerate(state.shape):
+                y = piece_y + i
+                if 0 <= y < game.rows:
+                    for j, filled in enumerate(row):
+                        if filled != 0 and 0 <= state.x + j < game.cols:
+                            piece_rows.setdefault(y, list(frame[y]))[state.x + j] = value
+
+        dirty = []
+        for y in range(game.rows):
+            row = piece_rows.get(y, frame[y])
+            drawn = self.cells[y]
+            if row == drawn:
+                continue
+            first = last = None
+            for x, value in enumerate(row):
+                if value != drawn[x]:
+                    area = pygame.Rect(x * block, y * block, block, block)
+                    if value != 0:
+                        screen.blit(self.blocks[value], (left + x * block, y * block))
+                    else:
+                        screen.blit(self.background, (left + x * block, y * block), area)
+                    if first is None:
+                        first = x
+                    last = x
+            dirty.append(pygame.Rect(left + first * block, y * block, (last - first + 1) * block, block))
+            self.cells[y] = list(row)
+        return dirty
+
+    def draw_hold(self, screen, state):
+        """Redraw the hold box if the held piece changed. Returns its rectangle, or None if unchanged."""
+        hold = state.hold
+        if hold == self.hold:
+            return None
+        self.hold = hold
+        block = self.game.block_size
+        rect = self.hold_rect
+        screen.fill(BACKGROUND, rect)
+        pygame.draw.rect(screen, BOX_LINE, (rect.x, rect.y, block * 2, block * 2), 2)
+        if hold is not None:
+            screen.blit(self.small_pieces[hold], (rect.x + block // 2, rect.y + block // 2))
+        return rect
+
+    def draw_side(self, screen, state):
+        """Redraw the text and preview panel if any of it changed. Returns its rectangle, or None if unchanged."""
+        preview = state.preview
+        values = (state.score, state.lines, int(time.time() - state.start_time))
+        if (preview, values) == self.side:
+            return None
+        self.side = (preview, values)
+
+        block = self.game.block_size
+        rect = self.side_rect
+        screen.fill(BACKGROUND, rect)
+        for i, (label, value) in enumerate(zip(("Score", "Lines", "Time"), values)):
+            screen.blit(self.text(label, f"{label}: {value}" + ("s" if label == "Time" else "")),
+                        (rect.x, TEXT_TOP + i * 40))
+
+        box_size = block * 2
+        for i, piece_type in enumerate(preview):
+            box_y = PREVIEW_TOP + i * (box_size + PREVIEW_STEP)
+            pygame.draw.rect(screen, BOX_LINE, (rect.x, box_y, box_size, box_size), 2)
+            screen.blit(self.small_pieces[piece_type], (rect.x + block // 2, box_y + block // 2))
+        return rect
+
+    def text(self, label, text):
+        """Rendered text for a label, re-rendered only when the text changes."""
+        cached = self.texts.get(label)
+        if cached is None or cached[0] != text:
+            cached = (text, self.font.render(text, True, TEXT))
+            self.texts[label] = cached
+        return cached[1]
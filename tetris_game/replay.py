@@ -0,0 +1,160 @@
+import mmap
+import struct
+from tetris_game.board import Board
+from tetris_game.engine import TetrisEngine
+from tetris_game.tetromino import Tetromino
+
+MAGIC = b'TKRP'
+VERSION = 1
+DEFAULT_KEYFRAME_INTERVAL = 256  # Pieces between keyframes; a seek re-simulates at most this many
+PIECE_CODES = (None, 'I', 'O', 'T', 'S', 'Z', 'J', 'L')  # 0 is empty / no piece
+INPUTS = ('MOVE_LEFT', 'MOVE_RIGHT', 'ROTATE_CW', 'ROTATE_CCW', 'MOVE_DOWN', 'HARD_DROP', 'HOLD',
+          'DAS_LEFT', 'DAS_RIGHT', 'SOFT_DROP')  # At most 16: inputs are stored as nibbles
+
+# magic, version, rows, cols, seed, keyframe interval, pieces, keyframes, input path bytes
+HEADER = struct.Struct('<4sBBBxQIQQQ')
+# x, y, rotation | hold << 2, input count
+RECORD = struct.Struct('<bbBB')
+# queue index, score, lines, combo, back-to-back, current piece, held piece, game over, input path offset;
+# followed by one piece code per board cell
+KEYFRAME = struct.Struct('<QIIhBBBBQ')
+
+_CODE_OF = {piece: code for code, piece in enumerate(PIECE_CODES)}
+_INPUT_OF = {name: code for code, name in enumerate(INPUTS)}
+
+
+class ReplayWriter:
+    """
+    Records a game as its seed plus one 4-byte record per piece (placement, hold flag, input count) and the
+    inputs packed two per byte. A keyframe snapshot of the game is stored every `keyframe_interval` pieces.
+    Pieces are played through TetrisEngine.apply_placement, so replays reproduce teleported placements
+    (spins are not recorded).
+    """
+
+    def __init__(self, game, keyframe_interval=DEFAULT_KEYFRAME_INTERVAL):
+        self.game = game
+        self.keyframe_interval = keyframe_interval
+        self.pieces = 0
+        self.records = bytearray()
+        self.keyframes = bytearray()
+        self.inputs = bytearray()
+        self.keyframe_count = 0
+
+    def play(self, x, y, rotation, use_hold=False, inputs=()):
+        """Record a placement and play it on the game. `inputs` are command names; a final HARD_DROP is implied."""
+        if self.pieces % self.keyframe_interval == 0:
+            self._snapshot()
+        codes = [_INPUT_OF[name] for name in inputs]
+        if codes and codes[-1] == _INPUT_OF['HARD_DROP']:
+            codes.pop()
+        self.records += RECORD.pack(x, y, rotation | use_hold << 2, len(codes))
+        for i in range(0, len(codes), 2):
+            self.inputs.append(codes[i] | (codes[i + 1] << 4 if i + 1 < len(codes) else 0))
+        self.pieces += 1
+        return self.game.apply_placement(x, y, rotation, use_hold)
+
+    def _snapshot(self):
+        game = self.game
+        hold = game.hold_piece.type if game.hold_piece is not None else None
+        self.keyframes += KEYFRAME.pack(game.queue_index, game.score, game.lines_cleared, game.combo,
+                                        game.last_was_b2b, _CODE_OF[game.current_piece.type], _CODE_OF[hold],
+                                        game.game_over, len(self.inputs))
+        self.keyframes += bytes(_CODE_OF[cell or None] for row in game.grid for cell in row)
+        self.keyframe_count += 1
+
+    def save(self, path):
+        if self.pieces == 0:
+            self._snapshot()  # A replay always has the starting keyframe
+        game = self.game
+        with open(path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, game.rows, game.cols, game.seed, self.keyframe_interval,
+                                self.pieces, self.keyframe_count, len(self.inputs)))
+            f.write(self.records)
+            f.write(self.keyframes)
+            f.write(self.inputs)
+
+
+class Replay:
+    """
+    Memory-mapped replay file. Opening reads only the header; placements, inputs and game states are
+    decoded on demand, and state_at() re-simulates from the nearest keyframe, so any piece is reached
+    in at most one keyframe interval of placements.
+    """
+
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, self.rows, self.cols, self.seed, self.keyframe_interval,
+         self.pieces, self.keyframe_count, _) = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} replay")
+        self._records_at = HEADER.size
+        self._keyframes_at = self._records_at + self.pieces * RECORD.size
+        self._keyframe_size = KEYFRAME.size + self.rows * self.cols
+        self._inputs_at = self._keyframes_at + self.keyframe_count * self._keyframe_size
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self.pieces
+
+    def placement(self, index):
+        """(x, y, rotation, used_hold) of piece `index`."""
+        if not 0 <= index < self.pieces:
+            raise IndexError(f"piece {index} is outside the replay")
+        x, y, flags, _ = RECORD.unpack_from(self._map, self._records_at + index * RECORD.size)
+        return x, y, flags & 3, bool(flags & 4)
+
+    def inputs(self, index):
+        """Input path of piece `index`, ending in HARD_DROP."""
+        if not 0 <= index < self.pieces:
+            raise IndexError(f"piece {index} is outside the replay")
+        keyframe = index // self.keyframe_interval
+        offset = KEYFRAME.unpack_from(self._map, self._keyframes_at + keyframe * self._keyframe_size)[-1]
+        # Input paths are variable length, so walk from the keyframe's offset to this piece
+        for previous in range(keyframe * self.keyframe_interval, index):
+            offset += (self._map[self._records_at + previous * RECORD.size + 3] + 1) // 2
+        count = self._map[self._records_at + index * RECORD.size + 3]
+        packed = self._map[self._inputs_at + offset:self._inputs_at + offset + (count + 1) // 2]
+        names = [INPUTS[packed[i // 2] >> (4 * (i % 2)) & 0xF] for i in range(count)]
+        names.append('HARD_DROP')
+        return names
+
+    def state_at(self, index):
+        """A TetrisEngine in the state just before piece `index` was placed (`len(replay)` for the final state)."""
+        if not 0 <= index <= self.pieces:
+            raise IndexError(f"piece {index} is outside the replay")
+        keyframe = min(index // self.keyframe_interval, self.keyframe_count - 1)
+        game = self._restore(keyframe)
+        for piece in range(keyframe * self.keyframe_interval, index):
+            game.apply_placement(*self.placement(piece))
+        return game
+
+    def _restore(self, keyframe):
+        at = self._keyframes_at + keyframe * self._keyframe_size
+        (queue_index, score, lines, combo, b2b, current, hold, game_over,
+         _) = KEYFRAME.unpack_from(self._map, at)
+        cells = self._map[at + KEYFRAME.size:at + self._keyframe_size]
+
+        game = TetrisEngine(self.rows, self.cols, self.seed)
+        grid = [[PIECE_CODES[code] or 0 for code in cells[y * self.cols:(y + 1) * self.cols]]
+                for y in range(self.rows)]
+        game.board = Board.from_grid(grid)
+        game.next_queue.seek(queue_index)
+        game.current_piece = Tetromino(PIECE_CODES[current])
+        game.current_piece.x = 3
+        game.hold_piece = Tetromino(PIECE_CODES[hold]) if hold else None
+        game.score = score
+        game.lines_cleared = lines
+        game.combo = combo
+        game.last_was_b2b = bool(b2b)
+        game.game_over = bool(game_over)
+        return game
@@ -0,0 +1,53 @@
+import threading
+import time
+
+
+class Simulation:
+    """
+    Runs a game in a background thread at its own fixed rate, independent of any display.
+    `step` advances the game by one step (for a bot, one piece) and returns False to stop; `rate` is steps per
+    second, or None to run as fast as possible. After every step a GameSnapshot of the game is published in
+    `snapshot`, which a renderer can sample at display rate: snapshots it has no frame for are simply skipped.
+    """
+
+    def __init__(self, game, step, rate=None):
+        self.game = game
+        self.step = step
+        self.rate = rate
+        self.steps = 0
+        self.snapshot = game.snapshot()  # Latest complete state; replaced, never modified
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop after the current step and wait for the thread."""
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _run(self):
+        interval = 1 / self.rate if self.rate else 0
+        next_step = time.perf_counter()
+        while not self._stop.is_set() and not self.game.game_over:
+            if self.step() is False:
+                break
+            self.steps += 1
+            self.snapshot = self.game.snapshot()
+            if interval:
+                next_step += interval
+                delay = next_step - time.perf_counter()
+                if delay > 0:
+                    self._stop.wait(delay)  # Sleeps, but wakes up at once on stop()
+                elif delay < -interval:
+                    next_step = time.perf_counter()  # More than a step behind: drop the backlog instead of bursting
+        self.snapshot = self.game.snapshot()
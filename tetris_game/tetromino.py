@@ -1,5 +1,5 @@
-import pygame
-from tetris_game.tetromino_data import COLORS, SHAPES, WALLKICKS, I_WALLKICKS, O_WALLKICKS
+from tetris_game.tetromino_data import SHAPES, WALLKICKS, I_WALLKICKS, O_WALLKICKS
+from tetris_game.piece_masks import get_piece_masks
 
 class Tetromino:
     def __init__(self, shape_key):
@@ -29,13 +29,13 @@ class Tetromino:
         
         return cloned_tetromino
     
-    def move(self, dx, dy, grid):
-        """Move the piece by dx, dy if no collision and within grid bounds."""
-        if not self.check_collision(grid, dx, dy):
+    def move(self, dx, dy, board):
+        """Move the piece by dx, dy if no collision and within board bounds."""
+        if not self.check_collision(board, dx, dy):
             self.x += dx
             self.y += dy
 
-    def rotate(self, grid, counterclockwise=False):
+    def rotate(self, board, counterclockwise=False):
         """Rotate the tetromino using predefined states and check collision."""
         original_rotation = self.rotation
 
@@ -49,12 +49,12 @@ class Tetromino:
         self.shape = self.shape_data[self.rotation]
 
         # Check if the new rotation causes a collision
-        if not self.check_collision(grid):
+        if not self.check_collision(board):
             self.was_rotated = True  # Rotation occurred successfully
             return True
         else:
             # Apply wall kick or revert if unsuccessful
-            if self.apply_wall_kick(grid, original_rotation, self.rotation):
+            if self.apply_wall_kick(board, original_rotation, self.rotation):
                 self.was_rotated = True
                 return True
             else:
@@ -64,7 +64,7 @@ class Tetromino:
                 self.was_rotated = False
                 return False
 
-    def apply_wall_kick(self, grid, original_rotation, new_rotation):
+    def apply_wall_kick(self, board, original_rotation, new_rotation):
         """Attempt to apply a wall kick based on the tetromino's rotation state."""
         key = f"{original_rotation}-{new_rotation}"  # Define rotation transition key
 
@@ -78,59 +78,16 @@ class Tetromino:
 
         # Attempt each offset in the wall kick data
         for offset_x, offset_y in kicks.get(key, []):
-            if not self.check_collision(grid, offset_x, -offset_y):  # Invert y offset because positive y is up
+            if not self.check_collision(board, offset_x, -offset_y):  # Invert y offset because positive y is up
                 self.x += offset_x
                 self.y -= offset_y
                 return True  # Wall kick successful
 
         return False  # No valid wall kick found
 
-    def check_collision(self, grid, offset_x=0, offset_y=0):
-        """Check if the current position of the tetromino collides with the grid or is out of bounds."""
-        for i, row in enumerate(self.shape):
-            for j, value in enumerate(row):
-                if value != 0:  # Only check solid blocks
-                    x = self.x + j + offset_x
-                    y = self.y + i + offset_y
-
-                    # Check if the piece is out of bounds
-                    if x < 0 or x >= len(grid[0]) or y >= len(grid):
-                        return True  # Collision detected (out of bounds)
-
-                    # Check if the piece collides with another block in the grid
-                    if y >= 0 and grid[y][x] != 0:
-                        return True  # Collision detected (with a locked piece)
-        return False  # No collision
-
-    def draw(self, screen, block_size, x_offset):
-        """Draw the piece on the screen."""
-        for i, row in enumerate(self.shape):
-            for j, value in enumerate(row):
-                if value != 0:
-                    pygame.draw.rect(screen, COLORS[self.type], pygame.Rect(
-                        x_offset + (self.x + j) * block_size, (self.y + i) * block_size, block_size, block_size))
-
-    def draw_preview(self, screen, block_size, offset_x, offset_y):
-        """Draw the preview piece at a smaller size."""
-        for i, row in enumerate(self.shape):
-            for j, value in enumerate(row):
-                if value != 0:
-                    pygame.draw.rect(screen, COLORS[self.type], pygame.Rect(
-                        offset_x + j * block_size // 2, offset_y + i * block_size // 2, block_size // 2, block_size // 2))
-
-    def draw_hold(self, screen, block_size, offset_x, offset_y):
-        """Draw the held piece."""
-        for i, row in enumerate(self.shape):
-            for j, value in enumerate(row):
-                if value != 0:
-                    pygame.draw.rect(screen, COLORS[self.type], pygame.Rect(
-                        offset_x + j * block_size // 2, offset_y + i * block_size // 2, block_size // 2, block_size // 2))
-
-def lock_piece_in_grid(piece, grid):
-    """
-    Lock the current piece in the grid after performing a hard drop.
-    """
-    for i, row in enumerate(piece.shape):
-        for j, value in enumerate(row):
-            if value != 0:  # Only lock solid blocks
-                grid[piece.y + i][piece.x + j] = piece.type
+    def check_collision(self, board, offset_x=0, offset_y=0):
+        """Check if the current position of the tetromino collides with the board or is out of bounds."""
+        entry = get_piece_masks(board.cols)[self.type][self.rotation].get(self.x + offset_x)
+        if entry is None:
+            return True  # Collision detected (out of bounds)
+        return board.collides(entry.rows, self.y + offset_y)